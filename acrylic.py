@@ -1,4 +1,5 @@
 import ctypes
+import sys
 
 # Accent states
 ACCENT_DISABLED = 0
@@ -28,7 +29,17 @@ class WINDOWCOMPOSITIONATTRIBDATA(ctypes.Structure):
     ]
 
 
+def is_supported():
+    """SetWindowCompositionAttribute only exists on Windows 10 and later."""
+    if sys.platform != "win32":
+        return False
+    return hasattr(ctypes.windll.user32, "SetWindowCompositionAttribute")
+
+
 def enable_acrylic(hwnd, tint=0xCC202020):
+    if not is_supported():
+        return False
+
     accent = ACCENTPOLICY()
     accent.AccentState = ACCENT_ENABLE_ACRYLICBLURBEHIND
     accent.AccentFlags = 0
@@ -43,4 +54,5 @@ def enable_acrylic(hwnd, tint=0xCC202020):
     data.SizeOfData = ctypes.sizeof(accent)
 
     set_window_comp_attr = ctypes.windll.user32.SetWindowCompositionAttribute
-    set_window_comp_attr(hwnd, ctypes.byref(data))
\ No newline at end of file
+    set_window_comp_attr(hwnd, ctypes.byref(data))
+    return True
@@ -10,7 +10,9 @@ a = Analysis(
     ['adhd_central_qt.py'],
     pathex=[],
     binaries=[],
-    datas=[('icons', 'icons'), ('icon.ico', '.')],
+    # Icons and stylesheets ship inside the compiled resource bundle
+    # (built by `python assets.py build`, see build.bat)
+    datas=[('assets.rcc', '.')],
     hiddenimports=[
         'PySide6.QtCore',
         'PySide6.QtGui',
@@ -1,47 +1,115 @@
 import sys
-import json
+import multiprocessing
 import threading
 import time
 from datetime import datetime, date, timedelta
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-from PySide6.QtCore import QSize, QTimer
-from PySide6.QtGui import QIcon, Qt, QCursor, QPainter, QColor, QFont
+from PySide6.QtCore import QSize, QTimer, QDate, QUrl, QEvent
+from PySide6.QtGui import (
+    Qt, QCursor, QPainter, QColor, QFont, QShortcut, QKeySequence, QActionGroup, QTextDocument,
+    QDesktopServices
+)
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QMainWindow, QListWidget,
+    QApplication, QWidget, QMainWindow, QListWidget, QListWidgetItem,
     QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QTextEdit, QStackedWidget, QFrame, QInputDialog,
-    QMessageBox, QDialog, QLineEdit, QSystemTrayIcon, QMenu
+    QMessageBox, QDialog, QLineEdit, QSystemTrayIcon, QMenu,
+    QComboBox, QDateEdit, QCheckBox, QFileDialog, QProgressBar
 )
 
-from acrylic import enable_acrylic
+from task_store import TaskStore, PRIORITIES, DEFAULT_PRIORITY
+from picker import TaskPicker
+from storage import Store, SYNC_INTERVAL, path_next_to, settings_path_for, load_settings, save_settings
+import transfer
+from sync import SyncEngine, state_path_for
+from archive import ArchiveStore, archive_dir_for
+from perf import perf, StallWatchdog
+from profiling import ProfilerSession, profile_dir_for
+from rendering import RENDER_MODES, select_backend
+import assets
+from drafts import DraftStore, drafts_dir_for
+from cache import LRUCache
+from clock import SYSTEM_CLOCK
+from records import SprintLog, SleepLog, ReviewList
+from heatmap import CalendarHeatmap
+from workers import TaskRunner
+import report
 
 SAVE_FILE = "data.json"
 SPRINT_SECONDS = 5 * 60
-
-
-def get_resource_path(filename):
-    """Get path to resource file, works in both development and packaged app"""
-    # In a PyInstaller bundle, sys.frozen is set
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(__file__)
-    
-    return os.path.join(base_path, filename)
+SYNC_INTERVAL_MS = 10 * 60 * 1000
+SYNC_JOB = ("sync",)
+DRAFT_DEBOUNCE_MS = 600
+REVIEW_DOC_CACHE_SIZE = 64
+REVIEW_LABEL_CACHE_SIZE = 2048
 
 
 def get_week_start(d: date):
     return d - timedelta(days=d.weekday())
 
 
+def export_job(job, data, archive, path):
+    """Runs on the worker pool; reports progress as records are written."""
+    try:
+        total = transfer.count_history(data, archive)
+        records = transfer.with_progress(transfer.iter_history(data, archive), job.progress, total)
+        count = transfer.export_records(records, path)
+    except OSError as e:
+        return f"Export failed: {e}"
+    return f"Exported {count} records."
+
+
+def import_job(job, path):
+    """Runs on the worker pool; batches are applied to the data on the GUI thread.
+
+    The whole file is checked before the first batch is published, so a bad
+    record imports nothing, as with ``transfer.py import``.
+    """
+    try:
+        # Progress covers both passes over the file
+        for _ in transfer.read_records(path, lambda done, total: job.progress(done, 2 * total)):
+            pass
+    except (OSError, ValueError) as e:
+        return f"Import failed, nothing imported: {e}"
+    try:
+        records = transfer.read_records(
+            path, lambda done, total: job.progress(total + done, 2 * total))
+        for batch in transfer.batched(records, transfer.IMPORT_BATCH_SIZE):
+            job.publish(batch)
+    except (OSError, ValueError) as e:
+        # Only if the file changed since it was checked
+        return f"Import stopped: {e}"
+    return "Import complete."
+
+
+def sync_job(job, engine, ops):
+    """Runs on the worker pool: the file I/O of a sync round. The ops were
+    collected, and what comes back is merged, on the GUI thread."""
+    try:
+        engine.write(ops)
+        return engine.incoming(), None
+    except OSError as e:
+        return None, f"Sync failed: {e}"
+
+
+def report_job(job, pool, data, archive, start, end, path, cache_path):
+    """Snapshot on the worker pool, then render in the report process."""
+    try:
+        snap = report.snapshot(data, archive, start, end)
+        path, _ = pool.submit(report.write_report, snap, path, cache_path).result()
+    except OSError as e:
+        return None, f"Report failed: {e}"
+    return path, f"Report saved to {os.path.basename(path)}."
+
+
 class AddTaskDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, render_backend, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Add Task")
-        self.setFixedSize(400, 180)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setStyleSheet("background: transparent;")
+        self.setFixedSize(400, 300)
+        render_backend.prepare_window(self)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -66,7 +134,46 @@ class AddTaskDialog(QDialog):
             }
         """)
         self.input.returnPressed.connect(self.accept)
-        
+
+        field_style = """
+            QLineEdit, QComboBox, QDateEdit {
+                background: rgba(15,23,42,0.55);
+                color: #f3f4f6;
+                border: 1px solid rgba(59,130,246,0.3);
+                border-radius: 6px;
+                padding: 6px;
+                font-size: 13px;
+            }
+            QCheckBox {
+                color: #e5e7eb;
+                font-size: 13px;
+            }
+        """
+
+        self.tags_input = QLineEdit()
+        self.tags_input.setPlaceholderText("Tags, comma separated (optional)")
+        self.tags_input.setStyleSheet(field_style)
+
+        meta_layout = QHBoxLayout()
+        meta_layout.setSpacing(10)
+
+        self.priority_input = QComboBox()
+        self.priority_input.addItems([p.capitalize() for p in PRIORITIES])
+        self.priority_input.setCurrentIndex(PRIORITIES.index(DEFAULT_PRIORITY))
+        self.priority_input.setStyleSheet(field_style)
+
+        self.due_check = QCheckBox("Due")
+        self.due_check.setStyleSheet(field_style)
+        self.due_input = QDateEdit(QDate.currentDate())
+        self.due_input.setCalendarPopup(True)
+        self.due_input.setEnabled(False)
+        self.due_input.setStyleSheet(field_style)
+        self.due_check.toggled.connect(self.due_input.setEnabled)
+
+        meta_layout.addWidget(self.priority_input, 1)
+        meta_layout.addWidget(self.due_check)
+        meta_layout.addWidget(self.due_input, 1)
+
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(10)
         
@@ -109,11 +216,24 @@ class AddTaskDialog(QDialog):
         
         layout.addWidget(title)
         layout.addWidget(self.input)
+        layout.addWidget(self.tags_input)
+        layout.addLayout(meta_layout)
         layout.addLayout(btn_layout)
     
     def get_text(self):
         return self.input.text().strip()
 
+    def get_tags(self):
+        return [t for t in self.tags_input.text().split(",") if t.strip()]
+
+    def get_priority(self):
+        return PRIORITIES[self.priority_input.currentIndex()]
+
+    def get_due(self):
+        if not self.due_check.isChecked():
+            return None
+        return self.due_input.date().toPython().isoformat()
+
 
 class CircularTimerWidget(QWidget):
     def __init__(self, app):
@@ -123,6 +243,7 @@ class CircularTimerWidget(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setStyleSheet("background: transparent;")
 
+    @perf.timed("paint.timer")
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -180,27 +301,11 @@ class CircularTimerWidget(QWidget):
 class SidebarButton(QPushButton):
     def __init__(self, icon_path, text):
         super().__init__()
-        self.setIcon(QIcon(get_resource_path(icon_path)))
+        self.setIcon(assets.icon(icon_path, QSize(22, 22)))
         self.setText(text)
         self.setIconSize(QSize(22, 22))
         self.setCheckable(True)
-        self.setStyleSheet("""
-            QPushButton {
-                color: #e5e7eb;
-                background: transparent;
-                border: none;
-                padding: 12px 16px;
-                text-align: left;
-                font-size: 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.08);
-            }
-            QPushButton:checked {
-                background: rgba(255,255,255,0.18);
-            }
-        """)
+        self.setStyleSheet(assets.stylesheet("styles/sidebar.qss"))
         self.setCursor(QCursor(Qt.PointingHandCursor))
 
 
@@ -209,9 +314,7 @@ class DashboardPage(QWidget):
         super().__init__()
         self.app = app
 
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAutoFillBackground(False)
-        self.setStyleSheet("background: transparent;")
+        self.app.render_backend.prepare(self)
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -224,6 +327,19 @@ class DashboardPage(QWidget):
         title_tasks = QLabel("Tasks")
         title_tasks.setStyleSheet("color: #e5e7eb; font-size: 18px; font-weight: 600;")
 
+        self.task_filter = QLineEdit()
+        self.task_filter.setPlaceholderText("Filter: tag:work  due:week  priority:high")
+        self.task_filter.setStyleSheet("""
+            QLineEdit {
+                background: rgba(15,23,42,0.55);
+                color: #f3f4f6;
+                border: 1px solid rgba(59,130,246,0.3);
+                border-radius: 8px;
+                padding: 6px;
+            }
+        """)
+        self.task_filter.textChanged.connect(self.refresh_tasks)
+
         self.tasks_list = QListWidget()
         self.tasks_list.setStyleSheet("""
             QListWidget {
@@ -238,7 +354,7 @@ class DashboardPage(QWidget):
         """)
 
         btn_add = QPushButton("Add Task")
-        btn_remove = QPushButton("Remove Task")
+        btn_remove = QPushButton("Complete Task")
         btn_pick = QPushButton("Pick Random")
 
         for b in (btn_add, btn_pick):
@@ -273,6 +389,7 @@ class DashboardPage(QWidget):
         btn_pick.clicked.connect(self.pick_random)
 
         left.addWidget(title_tasks)
+        left.addWidget(self.task_filter)
         left.addWidget(self.tasks_list)
         left.addWidget(btn_add)
         left.addWidget(btn_pick)
@@ -382,26 +499,34 @@ class DashboardPage(QWidget):
         
     # Task logic
     def add_task(self):
-        dialog = AddTaskDialog(self)
+        dialog = AddTaskDialog(self.app.render_backend, self)
         if dialog.exec():
             text = dialog.get_text()
             if text:
-                self.app.tasks.append(text)
+                self.app.tasks.add(
+                    text,
+                    tags=dialog.get_tags(),
+                    priority=dialog.get_priority(),
+                    due=dialog.get_due(),
+                )
                 self.app.save_data()
                 self.refresh()
 
     def remove_task(self):
-        row = self.tasks_list.currentRow()
-        if row >= 0:
-            self.app.tasks.pop(row)
+        item = self.tasks_list.currentItem()
+        if item is not None:
+            task = self.app.tasks.complete(item.data(Qt.UserRole))
+            if task is self.app.current_task:
+                self.app.current_task = None
+                self.current_task_label.setText("No active task")
             self.app.save_data()
             self.refresh()
 
     def pick_random(self):
-        if self.app.tasks:
-            import random
-            self.app.current_task = random.choice(self.app.tasks)
-            self.current_task_label.setText(f"Focus on: {self.app.current_task}")
+        task = self.app.picker.pick()
+        if task is not None:
+            self.app.current_task = task
+            self.current_task_label.setText(f"Focus on: {self.app.current_task.title}")
 
     # Sprint logic
     def start_sprint(self):
@@ -409,35 +534,54 @@ class DashboardPage(QWidget):
             return
         if not self.app.current_task:
             if self.app.tasks:
-                self.app.current_task = self.app.tasks[0]
+                self.app.current_task = self.app.tasks.first()
             else:
                 QMessageBox.information(self, "No tasks", "Add a task first.")
                 return
-        self.current_task_label.setText(f"Focus on: {self.app.current_task}")
+        self.current_task_label.setText(f"Focus on: {self.app.current_task.title}")
         self.app.sprint_running = True
         self.app.remaining_seconds = SPRINT_SECONDS
+        self.app.countdown_step = time.monotonic()
         threading.Thread(target=self.app.run_timer, daemon=True).start()
+        # Show the full countdown now and tick in phase with it from here on
+        self.app.refresh_timer_label()
 
     def stop_sprint(self):
         self.app.sprint_running = False
 
     # Sleep
     def log_sleep(self):
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M")
+        ts = self.app.clock.now().strftime("%Y-%m-%d %H:%M")
         self.app.sleep_log_data.append(f"Sleep at {ts}")
         self.app.save_data()
         self.refresh()
 
     def log_wake(self):
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M")
+        ts = self.app.clock.now().strftime("%Y-%m-%d %H:%M")
         self.app.sleep_log_data.append(f"Wake at {ts}")
         self.app.save_data()
         self.refresh()
 
-    def refresh(self):
+    def refresh_tasks(self):
         self.tasks_list.clear()
-        for t in self.app.tasks:
-            self.tasks_list.addItem(t)
+        for task in self.app.tasks.query(self.task_filter.text()):
+            item = QListWidgetItem(self._format_task(task))
+            item.setData(Qt.UserRole, task.id)
+            self.tasks_list.addItem(item)
+
+    def _format_task(self, task):
+        parts = [task.title]
+        if task.priority != DEFAULT_PRIORITY:
+            parts.append(f"!{task.priority}")
+        parts.extend(f"#{tag}" for tag in task.tags)
+        if task.due:
+            due = datetime.strptime(task.due, "%Y-%m-%d").strftime("%b %d")
+            parts.append(f"due {due}")
+        return "  ".join(parts)
+
+    @perf.timed("refresh.dashboard")
+    def refresh(self):
+        self.refresh_tasks()
 
         self.sleep_log.clear()
         for entry in self.app.sleep_log_data:
@@ -448,9 +592,7 @@ class WeeklyReviewPage(QWidget):
         super().__init__()
         self.app = app
 
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAutoFillBackground(False)
-        self.setStyleSheet("background: transparent;")
+        self.app.render_backend.prepare(self)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -479,8 +621,53 @@ class WeeklyReviewPage(QWidget):
         stats_layout = QVBoxLayout(stats_frame)
         stats_layout.setContentsMargins(5, 5, 5, 5)
         stats_layout.addWidget(self.stats_label)
+
+        # Shown while the stats are calculated in the background
+        self.stats_progress = QProgressBar()
+        self.stats_progress.setRange(0, 0)
+        self.stats_progress.setTextVisible(False)
+        self.stats_progress.setFixedHeight(4)
+        self.stats_progress.setStyleSheet("""
+            QProgressBar {
+                background: rgba(59,130,246,0.15);
+                border: none;
+                border-radius: 2px;
+                padding: 0px;
+            }
+            QProgressBar::chunk {
+                background: #3b82f6;
+                border-radius: 2px;
+            }
+        """)
+        self.stats_progress.hide()
+        stats_layout.addWidget(self.stats_progress)
         main_layout.addWidget(stats_frame)
 
+        # Activity heatmap over the last year
+        heatmap_header = QHBoxLayout()
+        heatmap_header.addWidget(self._make_section_title("Activity"))
+        heatmap_header.addStretch()
+        self.heatmap_mode = QComboBox()
+        self.heatmap_mode.addItem("Sprints", "sprints")
+        self.heatmap_mode.addItem("Sleep", "sleep")
+        self.heatmap_mode.setStyleSheet("""
+            QComboBox {
+                background: rgba(15,23,42,0.55);
+                border: 1px solid rgba(59,130,246,0.2);
+                border-radius: 6px;
+                padding: 4px 8px;
+                color: #f3f4f6;
+                font-size: 12px;
+            }
+        """)
+        self.heatmap_mode.currentIndexChanged.connect(
+            lambda: self.heatmap.set_mode(self.heatmap_mode.currentData()))
+        heatmap_header.addWidget(self.heatmap_mode)
+        main_layout.addLayout(heatmap_header)
+
+        self.heatmap = CalendarHeatmap(self.app.clock.today())
+        main_layout.addWidget(self.heatmap)
+
         # Review sections in a grid
         grid_layout = QHBoxLayout()
         grid_layout.setSpacing(15)
@@ -536,6 +723,25 @@ class WeeklyReviewPage(QWidget):
         btn_save.clicked.connect(self.save_review)
         main_layout.addWidget(btn_save)
 
+        # Draft autosave: each box persists only its own field, debounced
+        self.fields = {
+            "wins": self.wins,
+            "struggles": self.struggles,
+            "improvements": self.improve,
+            "priorities": self.priorities,
+        }
+        self._loading = False
+        self._draft_week = None
+        self._persisted = {}
+        self._draft_timers = {}
+        for field, box in self.fields.items():
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(DRAFT_DEBOUNCE_MS)
+            timer.timeout.connect(lambda f=field: self.write_draft(f))
+            box.textChanged.connect(timer.start)
+            self._draft_timers[field] = timer
+
         self.refresh()
 
     def _make_section_title(self, text):
@@ -561,8 +767,42 @@ class WeeklyReviewPage(QWidget):
         """)
         return box
 
+    def refresh_stats(self):
+        """Stats and heatmap only, leaving the boxes (and the cursor) alone."""
+        # Stats are computed on the worker pool; the boxes fill in immediately
+        self.stats_progress.show()
+        self._stats_key = self.app.request_week_stats(
+            get_week_start(self.app.clock.today()), self, self.show_stats, self.show_stats_error)
+        self.heatmap.set_counts(*self.app.day_counts(), today=self.app.clock.today())
+
+    @perf.timed("refresh.review")
     def refresh(self):
-        stats = self.app.compute_current_week_stats()
+        self.refresh_stats()
+
+        # Keep unsaved typing when switching back to this page mid-draft
+        self.flush_drafts()
+
+        today = self.app.clock.today()
+        week_start_str = get_week_start(today).strftime("%Y-%m-%d")
+        entry = next((w for w in self.app.weekly_reviews if w["week_start"] == week_start_str), None)
+        # Unsaved drafts win over the last saved review
+        texts = {field: (entry or {}).get(field, "") for field in self.fields}
+        texts.update(self.app.drafts.load(week_start_str))
+
+        self._loading = True
+        for field, box in self.fields.items():
+            # setPlainText resets the cursor, so only when the text differs
+            if box.toPlainText() != texts[field]:
+                box.setPlainText(texts[field])
+            self._draft_timers[field].stop()
+        self._loading = False
+        self._draft_week = week_start_str
+        self._persisted = texts
+
+    def show_stats(self, key, stats):
+        if key != self._stats_key:
+            return
+        self.stats_progress.hide()
         ws = stats["week_start"].strftime("%b %d, %Y")
         text = (
             f"<b>Week of:</b> {ws}<br>"
@@ -572,48 +812,83 @@ class WeeklyReviewPage(QWidget):
         )
         self.stats_label.setText(text)
 
-        today = date.today()
-        week_start_str = get_week_start(today).strftime("%Y-%m-%d")
-        entry = next((w for w in self.app.weekly_reviews if w["week_start"] == week_start_str), None)
+    def show_stats_error(self, key, trace):
+        if key != self._stats_key:
+            return
+        self.stats_progress.hide()
+        self.stats_label.setText(
+            "Couldn't calculate this week's stats: "
+            + (trace.strip().splitlines() or ["Unknown error"])[-1])
 
-        for box in (self.wins, self.struggles, self.improve, self.priorities):
-            box.clear()
+    def write_draft(self, field):
+        if self._loading or self._draft_week is None:
+            return
+        text = self.fields[field].toPlainText()
+        if text != self._persisted.get(field):
+            self.app.drafts.write(self._draft_week, field, text)
+            self._persisted[field] = text
+
+    def discard_drafts(self):
+        for timer in self._draft_timers.values():
+            timer.stop()
 
-        if entry:
-            self.wins.setPlainText(entry.get("wins", ""))
-            self.struggles.setPlainText(entry.get("struggles", ""))
-            self.improve.setPlainText(entry.get("improvements", ""))
-            self.priorities.setPlainText(entry.get("priorities", ""))
+    def flush_drafts(self):
+        for field, timer in self._draft_timers.items():
+            if timer.isActive():
+                timer.stop()
+                self.write_draft(field)
 
     def save_review(self):
-        today = date.today()
+        self.commit_review()
+        QMessageBox.information(self, "Saved", "Weekly review saved.")
+
+    def commit_review(self):
+        """Store the boxes as this week's review (save_review without the dialog)."""
+        today = self.app.clock.today()
         week_start = get_week_start(today).strftime("%Y-%m-%d")
 
+        for timer in self._draft_timers.values():
+            timer.stop()
+
         entry = {
             "week_start": week_start,
             "wins": self.wins.toPlainText(),
             "struggles": self.struggles.toPlainText(),
             "improvements": self.improve.toPlainText(),
-            "priorities": self.priorities.toPlainText()
+            "priorities": self.priorities.toPlainText(),
+            "updated": self.app.clock.now().isoformat()
         }
 
-        self.app.weekly_reviews = [
+        self.app.weekly_reviews[:] = [
             w for w in self.app.weekly_reviews if w["week_start"] != week_start
         ]
         self.app.weekly_reviews.append(entry)
         self.app.save_data()
-        QMessageBox.information(self, "Saved", "Weekly review saved.")
+        self.app.drafts.clear(week_start)
+        self.app.page_history.invalidate(week_start)
         self.refresh()
 
 
+class PreparedReview:
+    """Everything needed to show one review: stats line (None until the worker
+    pool has computed it) and a document per box."""
+
+    __slots__ = ("stats_text", "docs", "evicted")
+
+    def __init__(self, stats_text, docs):
+        self.stats_text = stats_text
+        self.docs = docs
+        self.evicted = False
+
+
 class ReviewHistoryPage(QWidget):
+    FIELDS = ("wins", "struggles", "improvements", "priorities")
+
     def __init__(self, app):
         super().__init__()
         self.app = app
 
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAutoFillBackground(False)
-        self.setStyleSheet("background: transparent;")
+        self.app.render_backend.prepare(self)
 
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -662,6 +937,10 @@ class ReviewHistoryPage(QWidget):
         scroll_layout.setContentsMargins(15, 15, 15, 15)
         scroll_layout.setSpacing(15)
 
+        self.detail_stats = QLabel("")
+        self.detail_stats.setStyleSheet("color: #e5e7eb; font-size: 13px;")
+        scroll_layout.addWidget(self.detail_stats)
+
         scroll_layout.addWidget(self._make_detail_title("Wins"))
         self.detail_wins = QTextEdit()
         self.detail_wins.setReadOnly(True)
@@ -697,6 +976,18 @@ class ReviewHistoryPage(QWidget):
         main_layout.addLayout(left_layout, 1)
         main_layout.addLayout(right_layout, 1)
 
+        # Prepared documents are swapped into the read-only boxes with
+        # setDocument instead of re-running setPlainText on every selection.
+        self.detail_boxes = dict(zip(self.FIELDS, (
+            self.detail_wins, self.detail_struggles, self.detail_improve, self.detail_priorities
+        )))
+        self._blank_docs = {field: QTextDocument(self) for field in self.FIELDS}
+        self._docs = LRUCache(REVIEW_DOC_CACHE_SIZE, on_evict=self._release)
+        self._labels = LRUCache(REVIEW_LABEL_CACHE_SIZE)
+        self._displayed = None
+        self._weeks_dirty = True
+        self.review_weeks = []
+
         self.refresh()
 
     def _make_detail_title(self, text):
@@ -716,61 +1007,201 @@ class ReviewHistoryPage(QWidget):
             }
         """
 
+    # Cache management
+    def invalidate(self, week_start=None):
+        """Drop cached documents for one week (or all) and re-list on next refresh."""
+        if week_start is None:
+            self._docs.clear()
+        else:
+            self._docs.invalidate(week_start)
+        self._weeks_dirty = True
+
+    def _release(self, week_start, prepared):
+        prepared.evicted = True
+        if prepared is not self._displayed:
+            for doc in prepared.docs.values():
+                doc.deleteLater()
+
+    def _label(self, week_start):
+        label = self._labels.get(week_start)
+        if label is None:
+            date_obj = datetime.strptime(week_start, "%Y-%m-%d").date()
+            label = f"Week of {date_obj.strftime('%b %d, %Y')}"
+            self._labels.put(week_start, label)
+        return label
+
+    def _prepare(self, week_start):
+        prepared = self._docs.get(week_start)
+        if prepared is None:
+            review = self.app.get_review(week_start) or {}
+            docs = {}
+            for field, box in self.detail_boxes.items():
+                doc = QTextDocument(self)
+                doc.setDefaultFont(box.font())
+                doc.setPlainText(review.get(field, ""))
+                docs[field] = doc
+            prepared = PreparedReview(None, docs)
+            if self._cacheable(week_start):
+                self._docs.put(week_start, prepared)
+            else:
+                # Shown once, released as soon as another review replaces it
+                prepared.evicted = True
+        if prepared.stats_text is None:
+            # Archived weeks read a whole year, so stats come from the worker
+            # pool; a job cancelled by leaving the page is simply asked again
+            self.app.request_week_stats(
+                date.fromisoformat(week_start), self,
+                lambda key, stats: self._stats_ready(prepared, stats),
+                lambda key, trace: self._stats_failed(prepared, trace))
+        return prepared
+
+    def _stats_ready(self, prepared, stats):
+        prepared.stats_text = (
+            f"{stats['total_sprints']} sprints ({stats['total_minutes']} mins), "
+            f"{stats['days_with_sprints']}/7 active days, "
+            f"{stats['sleep_entries']} sleep logs"
+        )
+        if prepared is self._displayed:
+            self.detail_stats.setText(prepared.stats_text)
+
+    def _stats_failed(self, prepared, trace):
+        # stats_text stays None, so showing the week again retries
+        if prepared is self._displayed:
+            self.detail_stats.setText(
+                "Couldn't calculate stats: " + (trace.strip().splitlines() or ["Unknown error"])[-1])
+
+    def _cacheable(self, week_start):
+        # The current week's stats still change as sprints finish
+        return week_start != get_week_start(self.app.clock.today()).isoformat()
+
+    def _show(self, prepared):
+        previous = self._displayed
+        self._displayed = prepared
+        if prepared is None:
+            self.detail_stats.clear()
+            for field, box in self.detail_boxes.items():
+                box.setDocument(self._blank_docs[field])
+        else:
+            self.detail_stats.setText(prepared.stats_text or "Calculating stats...")
+            for field, box in self.detail_boxes.items():
+                box.setDocument(prepared.docs[field])
+        if previous is not None and previous is not prepared and previous.evicted:
+            for doc in previous.docs.values():
+                doc.deleteLater()
+
+    def _prefetch(self, row):
+        for neighbour in (row + 1, row - 1):
+            if 0 <= neighbour < len(self.review_weeks):
+                week_start = self.review_weeks[neighbour]
+                if self._cacheable(week_start):
+                    self._prepare(week_start)
+
     def on_review_selected(self):
         current_row = self.reviews_list.currentRow()
         if current_row >= 0:
-            review = self.app.weekly_reviews[current_row]
-            self.detail_wins.setPlainText(review.get("wins", ""))
-            self.detail_struggles.setPlainText(review.get("struggles", ""))
-            self.detail_improve.setPlainText(review.get("improvements", ""))
-            self.detail_priorities.setPlainText(review.get("priorities", ""))
+            self._show(self._prepare(self.review_weeks[current_row]))
+            QTimer.singleShot(0, lambda: self._prefetch(current_row))
 
+    @perf.timed("refresh.history")
     def refresh(self):
+        self._show(None)
+        if not self._weeks_dirty:
+            self.reviews_list.setCurrentRow(-1)
+            return
+
+        # Sort reviews by date (newest first), including archived years
+        self.review_weeks = sorted(self.app.review_weeks(), reverse=True)
+        self._weeks_dirty = False
+
         self.reviews_list.clear()
-        self.detail_wins.clear()
-        self.detail_struggles.clear()
-        self.detail_improve.clear()
-        self.detail_priorities.clear()
+        for week_date in self.review_weeks:
+            self.reviews_list.addItem(self._label(week_date))
+
+
+class PerfOverlay(QLabel):
+    """Live span histograms and stall count, drawn over the main window."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("""
+            QLabel {
+                background: rgba(0,0,0,0.75);
+                color: #a7f3d0;
+                font-family: Consolas, monospace;
+                font-size: 11px;
+                padding: 8px;
+                border-radius: 6px;
+            }
+        """)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_text)
+        self.hide()
 
-        # Sort reviews by date (newest first)
-        sorted_reviews = sorted(self.app.weekly_reviews, key=lambda x: x["week_start"], reverse=True)
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.update_text()
+            self.show()
+            self.raise_()
+            self.timer.start(500)
 
-        for review in sorted_reviews:
-            week_date = review["week_start"]
-            date_obj = datetime.strptime(week_date, "%Y-%m-%d").date()
-            display_text = f"Week of {date_obj.strftime('%b %d, %Y')}"
-            self.reviews_list.addItem(display_text)
+    def update_text(self):
+        self.setText("\n".join(perf.summary_lines()))
+        self.adjustSize()
+        self.move(self.parent().width() - self.width() - 12, 12)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, data_path=SAVE_FILE, render_mode=None, clock=None):
         super().__init__()
 
+        self.data_path = data_path
+        # Everything that stamps or waits goes through this (see clock.py)
+        self.clock = clock or SYSTEM_CLOCK
         self.setWindowTitle("ADHD Central")
-        self.setWindowIcon(QIcon(get_resource_path("icon.ico")))
+        self.setWindowIcon(assets.icon("icon.ico"))
         self.resize(1200, 750)
 
-        # Transparent Qt background so acrylic shows through
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAutoFillBackground(False)
-        self.setStyleSheet("background: transparent;")
+        # Acrylic makes the window translucent; low-power mode paints it opaque
+        self.settings_path = settings_path_for(self.data_path)
+        self.settings = load_settings(self.settings_path)
+        self.render_backend = select_backend(render_mode or self.settings.get("render_mode"))
+        self.render_backend.prepare_window(self)
 
         # Data
-        self.tasks = []
-        self.sprint_blocks = []
-        self.sleep_log_data = []
-        self.weekly_reviews = []
+        self.tasks = TaskStore(clock=self.clock)
+        self.picker = TaskPicker(self.tasks)
+        self.sprint_blocks = SprintLog()
+        self.sleep_log_data = SleepLog()
+        self.weekly_reviews = ReviewList()
         self.current_task = None
         self.sprint_running = False
         self.remaining_seconds = 0
-
+        self.countdown_step = None  # time.monotonic() of the countdown's last step
+
+        self.archive = ArchiveStore(archive_dir_for(self.data_path))
+        self.drafts = DraftStore(drafts_dir_for(self.data_path))
+        # Snapshot plus change log; the timer thread saves too (see storage.py)
+        self.store = Store(self.data_path)
+        self._save_lock = threading.RLock()
+        # Tasks touched since the last save, logged one by one
+        self._changed_tasks = {}
+        self._tasks_reset = False
+        self.tasks.subscribe(self._on_task_change)
+        # Stats, exports and reports run here instead of on the GUI thread
+        self.runner = TaskRunner()
+        self.report_pool = None
+        self.importer = None  # set while an import is running
+        self.data_version = 0
+        self._hot_copies = None  # see hot_snapshot
         self.load_data()
 
         # Central widget
         central = QWidget()
-        central.setAttribute(Qt.WA_TranslucentBackground)
-        central.setAutoFillBackground(False)
-        central.setStyleSheet("background: transparent;")
+        self.render_backend.prepare(central)
 
         root_layout = QHBoxLayout(central)
         root_layout.setContentsMargins(0, 0, 0, 0)
@@ -833,9 +1264,7 @@ class MainWindow(QMainWindow):
 
         # Pages
         self.pages = QStackedWidget()
-        self.pages.setAttribute(Qt.WA_TranslucentBackground)
-        self.pages.setAutoFillBackground(False)
-        self.pages.setStyleSheet("background: transparent;")
+        self.render_backend.prepare(self.pages)
 
         self.page_dashboard = DashboardPage(self)
         self.page_review = WeeklyReviewPage(self)
@@ -854,21 +1283,48 @@ class MainWindow(QMainWindow):
         self.btn_dashboard.setChecked(True)
         self.pages.setCurrentIndex(0)
 
-        # Apply acrylic after window is shown
-        QTimer.singleShot(80, self.apply_acrylic)
+        # Apply acrylic (if enabled) after window is shown
+        QTimer.singleShot(80, lambda: self.render_backend.apply(self))
 
-        # Timer label refresher
+        # Timer label refresher; refresh_timer_label schedules each next tick
+        self._painted_seconds = None
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.refresh_timer_label)
-        self.timer.start(200)
+        self.timer.start(self.render_backend.next_tick_ms(None))
+
+        # Stall watchdog and performance overlay; the watchdog only runs while
+        # the window is on screen (see update_watchdog)
+        self.watchdog = StallWatchdog(clock=self.clock)
+        self.watchdog_timer = QTimer()
+        self.watchdog_timer.timeout.connect(self.watchdog.beat)
+
+        # fsync log records that no later save has flushed yet
+        self.store_sync_timer = QTimer()
+        self.store_sync_timer.timeout.connect(self.store.sync)
+        self.store_sync_timer.start(int(SYNC_INTERVAL * 1000))
+
+        self.perf_overlay = PerfOverlay(self)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, self.toggle_perf_overlay)
 
         # System tray icon
         self.setup_tray_icon()
 
+        # Shared-folder sync, if a folder has been chosen
+        self.sync_engine = SyncEngine(state_path_for(self.data_path), clock=self.clock,
+                                      archive=self.archive)
+        self.sync_engine.watch(self.tasks)
+        self.sync_timer = QTimer()
+        self.sync_timer.timeout.connect(self.sync_now)
+        if self.sync_engine.sync_dir:
+            self.sync_timer.start(SYNC_INTERVAL_MS)
+            QTimer.singleShot(0, self.sync_now)
+
     def setup_tray_icon(self):
         """Create system tray icon with context menu"""
         self.tray_icon = QSystemTrayIcon(self)
-        self.tray_icon.setIcon(QIcon(get_resource_path("icon.ico")))
+        self.tray_icon.setIcon(assets.icon("icon.ico"))
 
         # Create context menu
         tray_menu = QMenu()
@@ -877,6 +1333,51 @@ class MainWindow(QMainWindow):
         show_action.triggered.connect(self.show_window)
         
         tray_menu.addSeparator()
+
+        export_action = tray_menu.addAction("Export Data...")
+        export_action.triggered.connect(self.export_data)
+
+        import_action = tray_menu.addAction("Import Data...")
+        import_action.triggered.connect(self.import_data)
+
+        report_action = tray_menu.addAction("Generate Report...")
+        report_action.triggered.connect(self.generate_report)
+
+        tray_menu.addSeparator()
+
+        sync_action = tray_menu.addAction("Sync Now")
+        sync_action.triggered.connect(self.sync_now)
+
+        sync_folder_action = tray_menu.addAction("Choose Sync Folder...")
+        sync_folder_action.triggered.connect(self.choose_sync_folder)
+
+        tray_menu.addSeparator()
+
+        self.overlay_action = tray_menu.addAction("Performance Overlay")
+        self.overlay_action.setCheckable(True)
+        self.overlay_action.triggered.connect(self.toggle_perf_overlay)
+
+        dump_action = tray_menu.addAction("Dump Performance Data")
+        dump_action.triggered.connect(self.dump_perf_data)
+
+        self.profile_action = tray_menu.addAction("Start Profiling")
+        self.profile_action.triggered.connect(self.toggle_profiling)
+        self.profiler = ProfilerSession(profile_dir_for(self.data_path), clock=self.clock)
+
+        tray_menu.addSeparator()
+
+        render_menu = tray_menu.addMenu("Rendering")
+        render_labels = {"auto": "Automatic", "acrylic": "Acrylic", "opaque": "Low Power"}
+        current_mode = self.settings.get("render_mode", "auto")
+        self.render_group = QActionGroup(self)
+        for mode in RENDER_MODES:
+            action = render_menu.addAction(render_labels[mode])
+            action.setCheckable(True)
+            self.render_group.addAction(action)
+            action.setChecked(mode == current_mode)
+            action.triggered.connect(lambda checked, m=mode: self.set_render_mode(m))
+
+        tray_menu.addSeparator()
         
         quit_action = tray_menu.addAction("Exit")
         quit_action.triggered.connect(self.exit_app)
@@ -887,11 +1388,55 @@ class MainWindow(QMainWindow):
         # Double-click to restore window
         self.tray_icon.activated.connect(self.tray_icon_activated)
 
+    def toggle_perf_overlay(self):
+        self.perf_overlay.toggle()
+        self.overlay_action.setChecked(self.perf_overlay.isVisible())
+
+    def dump_perf_data(self):
+        now = self.clock.now()
+        path = path_next_to(self.data_path, f"perf-{now:%Y%m%d-%H%M%S}.json")
+        perf.dump(path, now)
+        self.tray_icon.showMessage("ADHD Central", f"Performance data written to {path}")
+
+    def toggle_profiling(self):
+        if not self.profiler.running:
+            self.profiler.start()
+            self.profile_action.setText("Stop Profiling")
+            self.tray_icon.showMessage("ADHD Central", "Profiling started.")
+        else:
+            paths = self.profiler.stop()
+            self.profile_action.setText("Start Profiling")
+            self.tray_icon.showMessage(
+                "ADHD Central", f"Profile written to {os.path.dirname(paths[0])}")
+
     def tray_icon_activated(self, reason):
         """Handle tray icon activation"""
         if reason == QSystemTrayIcon.DoubleClick:
             self.show_window()
 
+    def update_watchdog(self):
+        """Run the watchdog and its heartbeat only while the window can be seen;
+        the overlay lives inside the window, so this covers it too."""
+        if self.isVisible() and not self.isMinimized():
+            self.watchdog_timer.start(int(self.watchdog.interval * 1000))
+            self.watchdog.start()
+        else:
+            self.watchdog_timer.stop()
+            self.watchdog.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_watchdog()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_watchdog()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_watchdog()
+
     def show_window(self):
         """Show the main window"""
         self.showNormal()
@@ -899,6 +1444,17 @@ class MainWindow(QMainWindow):
 
     def exit_app(self):
         """Exit the application"""
+        if self.profiler.running:
+            # Write the session out rather than lose it
+            self.profiler.stop()
+        self.watchdog_timer.stop()
+        self.watchdog.stop()
+        self.runner.shutdown()
+        if self.report_pool is not None:
+            self.report_pool.shutdown(cancel_futures=True)
+        self.page_review.flush_drafts()
+        with self._save_lock:
+            self.store.close()
         self.close()
         QApplication.quit()
 
@@ -910,11 +1466,17 @@ class MainWindow(QMainWindow):
     def paintEvent(self, event):
         pass
     
-    def apply_acrylic(self):
-        hwnd = self.winId().__int__()
-        enable_acrylic(hwnd, 0x80282828)
+    def set_render_mode(self, mode):
+        self.settings["render_mode"] = mode
+        save_settings(self.settings_path, self.settings)
+        self.tray_icon.showMessage(
+            "ADHD Central", "Rendering mode will change the next time the app starts.")
 
     def switch_page(self, index):
+        # Background work for the page being left is no longer wanted
+        if index != self.pages.currentIndex():
+            self.runner.cancel_group(self.pages.currentWidget())
+
         self.btn_dashboard.setChecked(index == 0)
         self.btn_review.setChecked(index == 1)
         self.btn_history.setChecked(index == 2)
@@ -929,29 +1491,91 @@ class MainWindow(QMainWindow):
             self.page_history.refresh()
     # Timer logic
     def run_timer(self):
+        self.countdown_step = time.monotonic()
         while self.sprint_running and self.remaining_seconds > 0:
-            time.sleep(1)
+            self.clock.sleep(1)
             self.remaining_seconds -= 1
+            self.countdown_step = time.monotonic()
 
         if self.sprint_running:
             self.sprint_running = False
-            self.sprint_blocks.append(datetime.now().isoformat())
+            self.sprint_blocks.append(self.clock.now().isoformat())
+            if self.current_task is not None:
+                self.tasks.record_sprint(self.current_task.id)
             self.save_data()
 
     def refresh_timer_label(self):
-        self.page_dashboard.timer_widget.update()
+        # Only repaint when the countdown actually changed
+        if self.remaining_seconds != self._painted_seconds:
+            self._painted_seconds = self.remaining_seconds
+            self.page_dashboard.timer_widget.update()
+        self.timer.start(self.render_backend.next_tick_ms(self.ms_until_countdown_step()))
+
+    def ms_until_countdown_step(self):
+        step = self.countdown_step
+        if not self.sprint_running or step is None:
+            return None
+        return max(1000 - int((time.monotonic() - step) * 1000), 0)
 
     # Weekly stats
     def compute_current_week_stats(self):
-        today = date.today()
-        week_start = get_week_start(today)
-        week_end = week_start + timedelta(days=7)
+        return self.compute_week_stats(get_week_start(self.clock.today()))
+
+    def _archived(self, archived, week_start, week_end):
+        # Weeks in an archived year also read the (cached) segment
+        items = []
+        for year in {week_start.year, (week_end - timedelta(days=1)).year}:
+            if self.archive.has_year(year):
+                items.extend(archived(year))
+        return items
+
+    def request_week_stats(self, week_start, group, on_done, on_error=None):
+        """Compute a week's stats on the worker pool; on_done(key, stats) or
+        on_error(key, trace) runs on the GUI thread. Returns the job key;
+        identical requests share one job."""
+        key = ("stats", week_start.isoformat(), self.data_version)
+        sprint_blocks, sleep_log = self.hot_snapshot()
+        self.runner.submit(
+            key,
+            lambda job: self.compute_week_stats(week_start, sprint_blocks, sleep_log),
+            group=group,
+            on_done=lambda stats: on_done(key, stats),
+            on_error=None if on_error is None else lambda trace: on_error(key, trace),
+        )
+        return key
+
+    def hot_snapshot(self):
+        """Copies of the hot sprint and sleep lists for worker jobs.
 
-        sprints_this_week = [
+        The timer thread appends to the hot lists, so jobs get copies; every
+        change is saved (bumping data_version), so one copy per version is
+        shared by all the stats requests and prefetches made at that version.
+        """
+        version = self.data_version
+        cached = self._hot_copies
+        if (cached is None or cached[0] != version or cached[1] is not self.sprint_blocks
+                or cached[2] is not self.sleep_log_data):
+            cached = self._hot_copies = (
+                version, self.sprint_blocks, self.sleep_log_data,
+                self.sprint_blocks.copy(), self.sleep_log_data.copy())
+        return cached[3], cached[4]
+
+    @perf.timed("stats.week")
+    def compute_week_stats(self, week_start, sprint_blocks=None, sleep_log=None):
+        """Safe to call off the GUI thread when given snapshots of the hot lists."""
+        week_end = week_start + timedelta(days=7)
+        sprint_blocks = self.sprint_blocks if sprint_blocks is None else sprint_blocks
+        sleep_log = self.sleep_log_data if sleep_log is None else sleep_log
+
+        # The hot lists are filtered on their compact timestamps
+        start = datetime(week_start.year, week_start.month, week_start.day)
+        end = start + timedelta(days=7)
+        sprints_this_week = sprint_blocks.datetimes_between(start, end)
+        sprints_this_week.extend(
             datetime.fromisoformat(ts)
-            for ts in self.sprint_blocks
+            for ts in self._archived(self.archive.sprints, week_start, week_end)
             if week_start <= datetime.fromisoformat(ts).date() < week_end
-        ]
+        )
 
         days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         sprints_per_day = {d: 0 for d in days}
@@ -963,10 +1587,11 @@ class MainWindow(QMainWindow):
         total_minutes = total_sprints * (SPRINT_SECONDS // 60)
         days_with_sprints = sum(1 for v in sprints_per_day.values() if v > 0)
 
-        sleep_entries = [
-            entry for entry in self.sleep_log_data
+        sleep_entries = sleep_log.datetimes_between(start, end)
+        sleep_entries.extend(
+            entry for entry in self._archived(self.archive.sleep_log, week_start, week_end)
             if week_start <= datetime.strptime(entry.split(" at ")[1], "%Y-%m-%d %H:%M").date() < week_end
-        ]
+        )
 
         return {
             "week_start": week_start,
@@ -978,50 +1603,289 @@ class MainWindow(QMainWindow):
         }
 
     # Data persistence
+    def snapshot_data(self):
+        return {
+            "tasks": self.tasks.to_list(),
+            "task_archive": self.tasks.archive_to_list(),
+            "sprint_blocks": self.sprint_blocks.to_list(),
+            "sleep_log": self.sleep_log_data.to_list(),
+            "weekly_reviews": self.weekly_reviews.to_list()
+        }
+
+    def _on_task_change(self, event, task):
+        with self._save_lock:
+            if event == "reset":
+                self._tasks_reset = True
+                self._changed_tasks.clear()
+            elif event == "discard":
+                self._changed_tasks[task.id] = None
+            else:
+                self._changed_tasks[task.id] = task
+
+    def _task_changes(self):
+        changes = {"tasks": {}, "task_archive": {}}
+        for task_id, task in self._changed_tasks.items():
+            if task is None:
+                # Added and rolled back (see TaskStore._notify)
+                changes["tasks"][task_id] = None
+                changes["task_archive"][task_id] = None
+            elif self.tasks.get(task_id) is task:
+                changes["tasks"][task_id] = task.to_dict()
+            else:
+                # Completed (or changed after completion): lives in the archive
+                changes["tasks"][task_id] = None
+                changes["task_archive"][task_id] = task.to_dict()
+        self._changed_tasks.clear()
+        return changes
+
+    @perf.timed("storage.save")
     def save_data(self):
+        # The timer thread saves too; collect and write as one step
+        with self._save_lock:
+            self.data_version += 1
+            data = {
+                "sprint_blocks": self.sprint_blocks,
+                "sleep_log": self.sleep_log_data,
+                "weekly_reviews": self.weekly_reviews,
+            }
+            if self._tasks_reset:
+                data["tasks"] = self.tasks.to_list()
+                data["task_archive"] = self.tasks.archive_to_list()
+                self._tasks_reset = False
+                self._changed_tasks.clear()
+            self.store.save(data, self._task_changes())
+
+    @perf.timed("storage.load")
+    def load_data(self):
+        data = self.store.load()
+        self.tasks.load(data["tasks"], data["task_archive"])
+        # The store already holds these, unless they are old bare-string tasks
+        self._tasks_reset = any(isinstance(t, str) for t in data["tasks"])
+        # Compact representations; they read like the lists in data.json
+        self.sprint_blocks = SprintLog(data["sprint_blocks"])
+        self.sleep_log_data = SleepLog(data["sleep_log"])
+        self.weekly_reviews = ReviewList(data["weekly_reviews"])
+
+        # Move completed years into compressed archive segments
+        if self.archive.tier_out(self.sprint_blocks, self.sleep_log_data, self.weekly_reviews,
+                                 today=self.clock.today()):
+            self.save_data()
+
+    # Review lookups spanning the hot store and the archive
+    def review_weeks(self):
+        weeks = self.archive.review_weeks()
+        weeks.update(r["week_start"] for r in self.weekly_reviews)
+        return weeks
+
+    def day_counts(self):
+        """Sprints and sleep entries per ISO day, archived years included."""
+        sprints = self.archive.sprints_per_day()
+        sprints.update(self.sprint_blocks.day_counts())
+        sleep = self.archive.sleep_per_day()
+        sleep.update(self.sleep_log_data.day_counts())
+        return sprints, sleep
+
+    def get_review(self, week_start):
+        for review in self.weekly_reviews:
+            if review["week_start"] == week_start:
+                return review
+        return self.archive.get_review(week_start)
+
+    # Export / import
+    def export_data(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Data", "adhd_central_export.ndjson",
+            "NDJSON (*.ndjson);;CSV (*.csv)"
+        )
+        if path:
+            self.runner.submit(
+                ("export", path), export_job, self.snapshot_data(), self.archive, path,
+                on_progress=self.on_transfer_progress, on_done=self.on_export_finished)
+
+    def import_data(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Data", "", "NDJSON or CSV (*.ndjson *.jsonl *.csv)"
+        )
+        if not path:
+            return
+        if self.importer is not None:
+            self.tray_icon.showMessage(
+                "ADHD Central",
+                f"Still importing; {os.path.basename(path)} was not imported. "
+                "Try again when the current import finishes.")
+            return
+        self.importer = transfer.Importer(
+            self.tasks, self.sprint_blocks, self.sleep_log_data, self.weekly_reviews,
+            self.archive)
+        self.import_key = ("import", path)
+        self.runner.submit(
+            self.import_key, import_job, path,
+            on_partial=self.on_import_batch, on_progress=self.on_transfer_progress,
+            on_done=self.finish_import,
+            on_error=lambda trace: self.finish_import(
+                "Import failed: " + (trace.strip().splitlines() or ["Unknown error"])[-1]))
+
+    # Reports
+    def generate_report(self):
         data = {
-            "tasks": self.tasks,
-            "sprint_blocks": self.sprint_blocks,
-            "sleep_log": self.sleep_log_data,
-            "weekly_reviews": self.weekly_reviews
+            "sprint_blocks": self.sprint_blocks.copy(),
+            "sleep_log": self.sleep_log_data.copy(),
+            "weekly_reviews": self.weekly_reviews.copy(),
         }
-        with open(SAVE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        today = self.clock.today()
+        periods = {"Last 12 months": (today - timedelta(days=364), today)}
+        for year in reversed(report.available_years(data, self.archive) or [today.year]):
+            start, end = report.year_period(year)
+            periods[str(year)] = (start, min(end, today))
+        choice, ok = QInputDialog.getItem(
+            self, "Generate Report", "Period:", list(periods), 0, False)
+        if not ok:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Report", f"adhd_central_report_{choice.replace(' ', '_').lower()}.html",
+            "HTML (*.html)"
+        )
+        if not path:
+            return
 
-    def load_data(self):
+        if self.report_pool is None:
+            # Spawned, not forked: the child must not inherit Qt's threads
+            self.report_pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        start, end = periods[choice]
+        cache_path = os.path.join(report.report_dir_for(self.data_path), report.WEEK_CACHE_FILE)
+        self.tray_icon.setToolTip("ADHD Central - generating report")
+        self.runner.submit(
+            ("report", path, start, end, self.data_version), report_job,
+            self.report_pool, data, self.archive, start, end, path, cache_path,
+            on_done=self.on_report_finished, on_error=self.on_report_failed)
+
+    def on_report_finished(self, result):
+        path, message = result
+        self.tray_icon.setToolTip("ADHD Central")
+        self.tray_icon.showMessage("ADHD Central", message)
+        if path:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+    def on_report_failed(self, trace):
+        # A crashed worker breaks the pool; start a fresh one next time.
+        # Another failed report may already have dropped it.
+        if self.report_pool is not None:
+            self.report_pool.shutdown(wait=False)
+            self.report_pool = None
+        self.on_report_finished(
+            (None, "Report failed: " + (trace.strip().splitlines() or ["Unknown error"])[-1]))
+
+    # Sync
+    def choose_sync_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Choose Sync Folder")
+        if folder:
+            self.sync_engine.sync_dir = folder
+            self.sync_engine.save_state()
+            self.sync_timer.start(SYNC_INTERVAL_MS)
+            self.sync_now()
+
+    def sync_now(self):
+        if not self.sync_engine.sync_dir:
+            self.choose_sync_folder()
+            return
+        if self.runner.is_running(SYNC_JOB):
+            return
+        # Diffing the data stays here; writing and reading the shared folder doesn't
+        ops = self.sync_engine.outgoing(
+            self.tasks, self.sprint_blocks, self.sleep_log_data, self.weekly_reviews)
+        self.runner.submit(
+            SYNC_JOB, sync_job, self.sync_engine, ops,
+            on_done=self.on_sync_done,
+            on_error=lambda trace: self.on_sync_done(
+                (None, "Sync failed: " + (trace.strip().splitlines() or ["Unknown error"])[-1])))
+
+    def on_sync_done(self, result):
+        remote, error = result
+        if error:
+            # Forget what this round marked as pushed; the next one retries it
+            self.sync_engine.load_state()
+            self.tray_icon.showMessage("ADHD Central", error)
+            return
+        applied = self.sync_engine.merge(
+            remote, self.tasks, self.sprint_blocks, self.sleep_log_data, self.weekly_reviews)
+        if applied:
+            self.save_data()
+            self.refresh_data()
+        if self.sync_engine.changed:
+            self.sync_engine.save_state()
+
+    def refresh_data(self):
+        """Show data changed in the background (sync, import) on the current page,
+        without reloading text the user may be typing into."""
+        self.page_history.invalidate()
+        index = self.pages.currentIndex()
+        if index == 0:
+            self.page_dashboard.refresh()
+        elif index == 1:
+            self.page_review.refresh_stats()
+        elif index == 2:
+            self.page_history.refresh()
+
+    def on_import_batch(self, batch):
         try:
-            with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.tasks = data.get("tasks", [])
-                self.sprint_blocks = data.get("sprint_blocks", [])
-                self.sleep_log_data = data.get("sleep_log", [])
-                self.weekly_reviews = data.get("weekly_reviews", [])
-        except FileNotFoundError:
-            pass
+            self.importer.add_batch(batch)
+        except (KeyError, ValueError, TypeError) as e:
+            self.runner.cancel(self.import_key)
+            self.finish_import(f"Import failed: {e}")
+
+    def on_transfer_progress(self, done, total):
+        if total:
+            self.tray_icon.setToolTip(f"ADHD Central - transferring {done * 100 // total}%")
+
+    def on_export_finished(self, message):
+        self.tray_icon.setToolTip("ADHD Central")
+        self.tray_icon.showMessage("ADHD Central", message)
+
+    def finish_import(self, message):
+        self.importer = None
+        self.save_data()
+        self.refresh_data()
+        self.tray_icon.setToolTip("ADHD Central")
+        self.tray_icon.showMessage("ADHD Central", message)
 
     def clear_database(self):
         reply = QMessageBox.question(
             self,
             "Clear Database",
-            "Are you sure you want to clear all data? This cannot be undone.",
+            "Are you sure you want to clear all data, including archived years and "
+            "review drafts? This cannot be undone.",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            self.tasks = []
-            self.sprint_blocks = []
-            self.sleep_log_data = []
-            self.weekly_reviews = []
+            self.tasks.load([])
+            self.sprint_blocks.clear()
+            self.sleep_log_data.clear()
+            self.weekly_reviews.clear()
+            self.archive.clear()
+            self.page_review.discard_drafts()
+            self.drafts.clear_all()
             self.current_task = None
             self.sprint_running = False
             self.remaining_seconds = 0
             self.save_data()
+            self.page_history.invalidate()
             self.page_dashboard.refresh()
             self.page_dashboard.timer_widget.update()
+            self.switch_page(self.pages.currentIndex())
             QMessageBox.information(self, "Success", "Database cleared.")
 
 
 if __name__ == "__main__":
+    # Lets the frozen build start report worker processes
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1 and sys.argv[1] in ("export", "import"):
+        sys.exit(transfer.main(sys.argv[1:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "report":
+        sys.exit(report.main(sys.argv[2:]))
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     window = MainWindow()
@@ -0,0 +1,223 @@
+"""Read-only, compressed archive segments for completed years of history.
+
+Completed years of sprint_blocks, sleep_log and weekly_reviews are moved out
+of data.json into ``archive/<year>.json.gz``. ``archive/index.json`` lists
+the segments together with a precomputed summary of each (per-day and
+per-week sprint counts, sleep entry counts, which weeks have reviews), so
+most questions about old years are answered without opening a segment.
+When the raw records are needed the segment is decompressed once and kept
+in a small LRU cache.
+
+Segments are never rewritten. Records for an archived year that turn up
+later (from sync or import) go into an extra segment such as
+``2024-1.json.gz``; for reviews the newest segment wins.
+"""
+import gzip
+import json
+import os
+import shutil
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache
+
+from storage import path_next_to
+
+ARCHIVE_DIR = "archive"
+INDEX_FILE = "index.json"
+# Keep the previous year hot for a couple of weeks so late reviews and
+# synced edits for the last week of December land in the hot store.
+GRACE_DAYS = 14
+
+
+def archive_dir_for(data_path):
+    return path_next_to(data_path, ARCHIVE_DIR)
+
+
+def sprint_year(ts):
+    return int(ts[:4])
+
+
+def sleep_timestamp(entry):
+    return entry.split(" at ")[1]
+
+
+def sleep_year(entry):
+    return int(sleep_timestamp(entry)[:4])
+
+
+def review_year(review):
+    return int(review["week_start"][:4])
+
+
+def summarize(sprints, sleep_log, reviews):
+    per_day = Counter(ts[:10] for ts in sprints)
+    per_week = Counter()
+    for day, n in per_day.items():
+        d = date.fromisoformat(day)
+        per_week[(d - timedelta(days=d.weekday())).isoformat()] += n
+    sleep_per_day = Counter(sleep_timestamp(e)[:10] for e in sleep_log)
+    return {
+        "total_sprints": len(sprints),
+        "sprints_per_day": dict(sorted(per_day.items())),
+        "sprints_per_week": dict(sorted(per_week.items())),
+        "sleep_entries": len(sleep_log),
+        "sleep_per_day": dict(sorted(sleep_per_day.items())),
+        "review_weeks": sorted(r["week_start"] for r in reviews),
+    }
+
+
+class ArchiveStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self.segments = []
+        try:
+            with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                self.segments = json.load(f)["segments"]
+        except FileNotFoundError:
+            pass
+        self._load_segment = lru_cache(maxsize=4)(self._read_segment)
+
+    # Index
+    def years(self):
+        return sorted({s["year"] for s in self.segments})
+
+    def has_year(self, year):
+        return any(s["year"] == year for s in self.segments)
+
+    def _segments_for(self, year):
+        return [s for s in self.segments if s["year"] == year]
+
+    def summaries(self, year):
+        return [s["summary"] for s in self._segments_for(year)]
+
+    def sprints_per_day(self):
+        counts = Counter()
+        for segment in self.segments:
+            counts.update(segment["summary"]["sprints_per_day"])
+        return counts
+
+    def sleep_per_day(self):
+        counts = Counter()
+        for segment in self.segments:
+            counts.update(segment["summary"].get("sleep_per_day", {}))
+        return counts
+
+    def review_weeks(self):
+        weeks = set()
+        for segment in self.segments:
+            weeks.update(segment["summary"]["review_weeks"])
+        return weeks
+
+    def counts(self):
+        """Total archived records per kind, straight from the summaries."""
+        totals = Counter()
+        for segment in self.segments:
+            summary = segment["summary"]
+            totals["sprint"] += summary["total_sprints"]
+            totals["sleep"] += summary["sleep_entries"]
+            totals["review"] += len(summary["review_weeks"])
+        return totals
+
+    # Segment contents (decompressed on demand, cached)
+    def _read_segment(self, filename):
+        with gzip.open(os.path.join(self.directory, filename), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def segment_data(self):
+        """Yield each segment's records in the layout of data.json."""
+        for segment in self.segments:
+            yield self._load_segment(segment["file"])
+
+    def sprints(self, year):
+        result = []
+        for segment in self._segments_for(year):
+            result.extend(self._load_segment(segment["file"])["sprint_blocks"])
+        return result
+
+    def sleep_log(self, year):
+        result = []
+        for segment in self._segments_for(year):
+            result.extend(self._load_segment(segment["file"])["sleep_log"])
+        return result
+
+    def reviews(self, year):
+        by_week = {}
+        for segment in self._segments_for(year):
+            for review in self._load_segment(segment["file"])["weekly_reviews"]:
+                by_week[review["week_start"]] = review
+        return by_week
+
+    def get_review(self, week_start):
+        return self.reviews(int(week_start[:4])).get(week_start)
+
+    def clear(self):
+        """Delete every segment and the index."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.segments = []
+        self._load_segment.cache_clear()
+
+    # Tiering
+    def _write_segment(self, year, sprints, sleep_log, reviews):
+        os.makedirs(self.directory, exist_ok=True)
+        n = len(self._segments_for(year))
+        filename = f"{year}.json.gz" if n == 0 else f"{year}-{n}.json.gz"
+        payload = {
+            "year": year,
+            "sprint_blocks": sorted(sprints),
+            "sleep_log": sorted(sleep_log, key=sleep_timestamp),
+            "weekly_reviews": sorted(reviews, key=lambda r: r["week_start"]),
+        }
+        tmp = os.path.join(self.directory, filename + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, os.path.join(self.directory, filename))
+        self.segments.append({
+            "file": filename,
+            "year": year,
+            "summary": summarize(payload["sprint_blocks"], payload["sleep_log"],
+                                 payload["weekly_reviews"]),
+        })
+
+    def _write_index(self):
+        tmp = os.path.join(self.directory, INDEX_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"segments": self.segments}, f, indent=1)
+        os.replace(tmp, os.path.join(self.directory, INDEX_FILE))
+
+    def tier_out(self, sprint_blocks, sleep_log, weekly_reviews, today):
+        """Move completed years out of the given lists (in place) into segments.
+
+        ``today`` comes from the caller's clock. Returns the number of
+        records taken off the lists. Callers save the
+        hot store afterwards; segments and the index are written first, so a
+        crash in between only leaves duplicates that the next run filters out.
+        """
+        cutoff_year = (today - timedelta(days=GRACE_DAYS)).year
+
+        old_years = {sprint_year(ts) for ts in sprint_blocks if sprint_year(ts) < cutoff_year}
+        old_years |= {sleep_year(e) for e in sleep_log if sleep_year(e) < cutoff_year}
+        old_years |= {review_year(r) for r in weekly_reviews if review_year(r) < cutoff_year}
+        if not old_years:
+            return 0
+
+        before = len(sprint_blocks) + len(sleep_log) + len(weekly_reviews)
+        for year in sorted(old_years):
+            sprints = [ts for ts in sprint_blocks if sprint_year(ts) == year]
+            sleep = [e for e in sleep_log if sleep_year(e) == year]
+            reviews = [dict(r) for r in weekly_reviews if review_year(r) == year]
+            if self.has_year(year):
+                # Late arrivals: skip what the existing segments already hold
+                known_sprints = set(self.sprints(year))
+                known_sleep = set(self.sleep_log(year))
+                known_reviews = self.reviews(year)
+                sprints = [ts for ts in sprints if ts not in known_sprints]
+                sleep = [e for e in sleep if e not in known_sleep]
+                reviews = [r for r in reviews if known_reviews.get(r["week_start"]) != r]
+            if sprints or sleep or reviews:
+                self._write_segment(year, sprints, sleep, reviews)
+
+        self._write_index()
+        sprint_blocks[:] = [ts for ts in sprint_blocks if sprint_year(ts) not in old_years]
+        sleep_log[:] = [e for e in sleep_log if sleep_year(e) not in old_years]
+        weekly_reviews[:] = [r for r in weekly_reviews if review_year(r) not in old_years]
+        return before - len(sprint_blocks) - len(sleep_log) - len(weekly_reviews)
@@ -0,0 +1,127 @@
+"""Icons and stylesheets, served from a compiled Qt resource bundle.
+
+``assets.qrc`` lists the icons and stylesheets; ``python assets.py build``
+compiles them into a single binary ``assets.rcc`` that the PyInstaller
+build ships instead of loose files. At runtime ``register()`` maps the
+bundle under ``:/``; without a bundle (a fresh checkout) the loose files
+are used instead.
+
+Icons are rasterised once per (size, device pixel ratio) and kept both in
+memory and as PNGs in the user cache directory, so later starts load small
+PNGs instead of rendering SVGs again.
+"""
+import hashlib
+import os
+import subprocess
+import sys
+
+from PySide6.QtCore import QFile, QIODevice, QResource, QSize, QStandardPaths
+from PySide6.QtGui import QGuiApplication, QIcon, QPixmap
+
+QRC_FILE = "assets.qrc"
+RCC_FILE = "assets.rcc"
+
+_registered = False
+_icons = {}
+_pixmaps = {}
+_stylesheets = {}
+
+
+def get_resource_path(filename):
+    """Get path to resource file, works in both development and packaged app"""
+    # In a PyInstaller bundle, sys.frozen is set
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+
+    return os.path.join(base_path, filename)
+
+
+def register():
+    """Map assets.rcc under ':/' if it exists; returns whether it did."""
+    global _registered
+    if not _registered:
+        rcc = get_resource_path(RCC_FILE)
+        _registered = os.path.exists(rcc) and QResource.registerResource(rcc)
+    return _registered
+
+
+def asset_path(name):
+    return f":/{name}" if register() else get_resource_path(name)
+
+
+def _cache_key(name):
+    # Invalidate the disk cache whenever the bundle (or loose icon) changes
+    source = get_resource_path(RCC_FILE) if register() else get_resource_path(name)
+    try:
+        st = os.stat(source)
+    except FileNotFoundError:
+        return "missing"
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def _cache_dir():
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    return os.path.join(base or get_resource_path(".cache"), "icons")
+
+
+def pixmap(name, size, dpr=None):
+    """A pixmap of the named icon at size (logical pixels) for the given DPR."""
+    if dpr is None:
+        screen = QGuiApplication.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen else 1.0
+    key = (name, size.width(), size.height(), dpr)
+    pm = _pixmaps.get(key)
+    if pm is not None:
+        return pm
+
+    digest = hashlib.sha1(f"{name}|{key[1:]}|{_cache_key(name)}".encode()).hexdigest()[:16]
+    cached = os.path.join(_cache_dir(), f"{digest}.png")
+    pm = QPixmap()
+    if not pm.load(cached):
+        physical = QSize(round(size.width() * dpr), round(size.height() * dpr))
+        pm = QIcon(asset_path(name)).pixmap(physical)
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        pm.save(cached, "PNG")
+    pm.setDevicePixelRatio(dpr)
+    _pixmaps[key] = pm
+    return pm
+
+
+def icon(name, size=None):
+    """A shared QIcon; with a size it is built from the cached raster."""
+    key = (name, None if size is None else (size.width(), size.height()))
+    result = _icons.get(key)
+    if result is None:
+        result = QIcon(asset_path(name)) if size is None else QIcon(pixmap(name, size))
+        _icons[key] = result
+    return result
+
+
+def stylesheet(name):
+    text = _stylesheets.get(name)
+    if text is None:
+        f = QFile(asset_path(name))
+        if not f.open(QIODevice.ReadOnly | QIODevice.Text):
+            raise FileNotFoundError(name)
+        text = _stylesheets[name] = bytes(f.readAll()).decode("utf-8")
+        f.close()
+    return text
+
+
+def build_rcc(output=RCC_FILE):
+    """Compile assets.qrc into a binary resource bundle with pyside6-rcc."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run(
+        ["pyside6-rcc", "--binary", "-o", output, QRC_FILE],
+        cwd=here, check=True,
+    )
+    return os.path.join(here, output)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["build"]:
+        print("usage: python assets.py build", file=sys.stderr)
+        sys.exit(2)
+    print(build_rcc())
@@ -0,0 +1,91 @@
+"""Resident memory per event: plain lists/dicts vs the compact records.
+
+Builds a synthetic history (sprints every ~20 minutes of the working day, a
+sleep and wake entry per day, one review per week) and measures what each
+representation keeps alive, using tracemalloc. "plain" is what load_data
+used to hold: the lists straight out of json.load. "compact" is SprintLog,
+SleepLog and ReviewList from records.py.
+
+    python benchmarks/bench_memory.py [events ...]    # default 10000 100000 1000000
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from records import ReviewList, SleepLog, SprintLog  # noqa: E402
+
+REVIEW_TEXT = "- finished the thing\n- went for a run\n- kept the streak going"
+
+
+def make_history(events):
+    """(sprints, sleep, reviews) with `events` sprint and sleep entries in total."""
+    sprints, sleep, reviews = [], [], []
+    day = datetime(2020, 1, 6)
+    while len(sprints) + len(sleep) < events:
+        for i in range(min(24, events - len(sprints) - len(sleep) - 2)):
+            sprints.append((day.replace(hour=9) + timedelta(minutes=20 * i, seconds=i,
+                                                            microseconds=1000 * i)).isoformat())
+        sleep.append(f"Sleep at {day.replace(hour=23, minute=day.day):%Y-%m-%d %H:%M}")
+        sleep.append(f"Wake at {(day + timedelta(days=1)).replace(hour=7):%Y-%m-%d %H:%M}")
+        if day.weekday() == 0:
+            reviews.append({
+                "week_start": day.strftime("%Y-%m-%d"),
+                "wins": REVIEW_TEXT, "struggles": REVIEW_TEXT,
+                "improvements": REVIEW_TEXT, "priorities": REVIEW_TEXT,
+                "updated": day.isoformat(),
+            })
+        day += timedelta(days=1)
+    return sprints, sleep, reviews
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, with its result alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(events):
+    sprints, sleep, reviews = make_history(events)
+    # Fresh copies, as json.load would produce, so no strings are shared
+    raw = json.dumps({"sprint_blocks": sprints, "sleep_log": sleep, "weekly_reviews": reviews})
+    del sprints, sleep, reviews
+
+    def plain():
+        return json.loads(raw)
+
+    def compact():
+        data = json.loads(raw)
+        return (SprintLog(data.pop("sprint_blocks")), SleepLog(data.pop("sleep_log")),
+                ReviewList(data.pop("weekly_reviews")))
+
+    counts = json.loads(raw)
+    n_sprints, n_sleep = len(counts["sprint_blocks"]), len(counts["sleep_log"])
+    n_reviews = len(counts["weekly_reviews"])
+    del counts
+    return n_sprints, n_sleep, n_reviews, measure(plain), measure(compact)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'events':>10}{'reviews':>9}{'plain B/event':>15}{'compact B/event':>17}{'ratio':>8}")
+    for events in sizes:
+        n_sprints, n_sleep, n_reviews, plain, compact = run(events)
+        total = n_sprints + n_sleep
+        print(f"{total:>10}{n_reviews:>9}{plain / total:>15.1f}{compact / total:>17.1f}"
+              f"{plain / compact:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Compare what the acrylic and low-power backends cost while a sprint runs.
+
+Builds the main window once per backend against a throwaway data file,
+starts a real sprint and lets the event loop run for a few seconds. For each
+backend it reports what was measured during that run:
+
+- timer ticks and repaints actually delivered (per minute), so the repaint
+  guard in refresh_timer_label is accounted for, and how many widgets each
+  repaint walks (transparent parents repaint under the timer widget),
+- process CPU time per minute spent running the window,
+- the cost of one repaint: the window rendered over the region that was
+  actually dirty, into the backing store format the backend implies
+  (ARGB32 premultiplied cleared to transparent for acrylic, RGB32 for
+  opaque).
+
+The offscreen platform doesn't composite a translucent window against the
+desktop and DWM's blur runs outside the process, so neither is in these
+numbers; on Windows acrylic pays those on top.
+
+    python benchmarks/bench_render.py [seconds per backend] [frames]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QEvent, QEventLoop, QObject, QPoint, Qt, QTimer
+from PySide6.QtGui import QImage, QRegion
+from PySide6.QtWidgets import QApplication
+
+import adhd_central_qt
+from rendering import AcrylicBackend, OpaqueBackend
+
+
+class PaintCounter(QObject):
+    """Counts paint events per widget in one window and collects the dirty region."""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.counts = Counter()
+        self.dirty = QRegion()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj.window() is self.window:
+            self.counts[id(obj)] += 1
+            self.dirty += event.region().translated(obj.mapTo(self.window, QPoint()))
+        return False
+
+
+def time_frames(widget, region, image_format, frames):
+    image = QImage(widget.size(), image_format)
+    start = time.perf_counter()
+    for _ in range(frames):
+        image.fill(Qt.transparent)
+        widget.render(image, QPoint(), region)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def measure(backend, seconds, frames):
+    adhd_central_qt.select_backend = lambda mode: backend
+    app = QApplication.instance()
+    with tempfile.TemporaryDirectory() as tmp:
+        window = adhd_central_qt.MainWindow(data_path=os.path.join(tmp, "data.json"))
+        window.show()
+        QApplication.processEvents()
+
+        ticks = 0
+        original_tick = window.refresh_timer_label
+
+        def counted_tick():
+            nonlocal ticks
+            ticks += 1
+            original_tick()
+        window.timer.timeout.disconnect()
+        window.timer.timeout.connect(counted_tick)
+
+        window.sprint_running = True
+        window.remaining_seconds = adhd_central_qt.SPRINT_SECONDS
+        timer_thread = threading.Thread(target=window.run_timer, daemon=True)
+        timer_thread.start()
+
+        counter = PaintCounter(window)
+        app.installEventFilter(counter)
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        cpu = time.process_time()
+        loop.exec()
+        cpu_ms = (time.process_time() - cpu) * 1000
+        app.removeEventFilter(counter)
+
+        window.sprint_running = False
+        timer_thread.join()
+
+        # Every repaint paints the timer widget once, plus its parents
+        repaints = max(counter.counts.values(), default=0)
+        widgets = sum(counter.counts.values()) / repaints if repaints else 0.0
+        fmt = QImage.Format_ARGB32_Premultiplied if backend.translucent else QImage.Format_RGB32
+        repaint_ms = time_frames(window, counter.dirty, fmt, frames) if repaints else 0.0
+
+        window.watchdog.stop()
+        window.runner.shutdown()
+        window.store.close()
+        window.tray_icon.hide()
+        window.deleteLater()
+
+    per_minute = 60 / seconds
+    return ticks * per_minute, repaints * per_minute, widgets, cpu_ms * per_minute, repaint_ms
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    app = QApplication(sys.argv[:1])
+    print(f"measured over {seconds:g} s per backend, offscreen (no compositor, no DWM blur)")
+    print(f"{'backend':<10}{'ticks/min':>11}{'repaints/min':>14}{'widgets':>9}"
+          f"{'CPU ms/min':>12}{'ms/repaint':>12}")
+    for backend in (AcrylicBackend(), OpaqueBackend()):
+        ticks, repaints, widgets, cpu_ms, repaint_ms = measure(backend, seconds, frames)
+        print(f"{backend.name:<10}{ticks:>11.0f}{repaints:>14.0f}{widgets:>9.1f}"
+              f"{cpu_ms:>12.1f}{repaint_ms:>12.3f}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Startup cost of sidebar/window icons: loose SVG files vs the asset pipeline.
+
+"loose" is the old path: every SidebarButton builds a QIcon from an SVG on
+disk and Qt renders it the first time it is painted; icon.ico is loaded
+once for the window and again for the tray. "bundle" goes through
+assets.py: the .rcc bundle, one shared QIcon per name and pre-rasterised
+pixmaps from the on-disk cache (warmed by a previous run). Each scenario
+runs in a fresh process so in-memory caches don't leak between them.
+
+    python assets.py build
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICONS = ["icons/home_filled.svg", "icons/calendar_filled.svg", "icons/calendar_filled.svg"]
+
+
+def run_scenario(name):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, ROOT)
+    from PySide6.QtCore import QSize
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+    import assets
+
+    app = QApplication([])
+    size = QSize(22, 22)
+    start = time.perf_counter()
+    if name == "loose":
+        for path in ICONS:
+            QIcon(assets.get_resource_path(path)).pixmap(size)
+        for _ in range(2):
+            QIcon(assets.get_resource_path("icon.ico")).pixmap(QSize(32, 32))
+    else:
+        assets.register()
+        for path in ICONS:
+            assets.icon(path, size).pixmap(size)
+        for _ in range(2):
+            assets.icon("icon.ico").pixmap(QSize(32, 32))
+        assets.stylesheet("styles/sidebar.qss")
+    elapsed = (time.perf_counter() - start) * 1000
+    app.quit()
+    return elapsed
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--scenario":
+        print(run_scenario(sys.argv[2]))
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not os.path.exists(os.path.join(ROOT, "assets.rcc")):
+        print("assets.rcc missing; run `python assets.py build` first", file=sys.stderr)
+        sys.exit(1)
+
+    def sample(name):
+        out = subprocess.run(
+            [sys.executable, __file__, "--scenario", name],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        return float(out.strip().splitlines()[-1])
+
+    sample("bundle")  # warm the pixmap disk cache
+    results = {name: [sample(name) for _ in range(runs)] for name in ("loose", "bundle")}
+    for name, times in results.items():
+        print(f"{name:<8} median {statistics.median(times):7.2f} ms   "
+              f"min {min(times):7.2f} ms   ({runs} runs)")
+    saving = statistics.median(results["loose"]) - statistics.median(results["bundle"])
+    print(f"saving   {saving:7.2f} ms per start")
+
+
+if __name__ == "__main__":
+    main()
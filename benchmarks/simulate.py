@@ -0,0 +1,215 @@
+"""Drive the app through months of usage on a simulated clock.
+
+Every simulated day wakes up, adds and completes the odd task, runs a
+handful of sprints through the real ``run_timer``, logs sleep and, on
+Sundays, writes the weekly review. The clock only moves when the harness
+(or the timer's sleep) moves it, so a year takes seconds and every run with
+the same seed produces the same data.
+
+Once a day the harness measures what a user would feel as the history
+grows: the size of data.json and its change log, archive size, save
+latency and the refresh latency of each page. Every --restart-every days the window is rebuilt from disk,
+which also times startup and runs archive tiering after New Year. Results
+are printed per week.
+
+    python benchmarks/simulate.py [--days 365] [--start 2025-09-01] [--seed 1]
+                                  [--restart-every 30] [--dir DIR] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import adhd_central_qt as app_module  # noqa: E402
+from clock import SimulatedClock  # noqa: E402
+from storage import log_path_for  # noqa: E402
+from task_store import PRIORITIES  # noqa: E402
+
+WORDS = ("email", "report", "laundry", "taxes", "groceries", "refactor", "call mum",
+         "dentist", "garden", "invoice", "slides", "budget", "read", "bike repair")
+TAGS = ("work", "home", "admin", "health")
+
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+class Simulation:
+    def __init__(self, directory, start, seed, restart_every):
+        self.directory = directory
+        self.data_path = os.path.join(directory, "data.json")
+        self.clock = SimulatedClock(datetime.combine(start, datetime.min.time()))
+        self.rng = random.Random(seed)
+        self.restart_every = restart_every
+        self.window = None
+        self.days = []
+        self.startups = []
+
+    def open_window(self):
+        if self.window is not None:
+            self.window.watchdog.stop()
+            self.window.runner.shutdown()
+            self.window.store.close()
+            self.window.deleteLater()
+        start = time.perf_counter()
+        self.window = app_module.MainWindow(data_path=self.data_path, clock=self.clock)
+        self.startups.append((self.clock.today(), (time.perf_counter() - start) * 1000))
+
+    def at(self, day, hour, minute=0, jitter=0):
+        """Move the clock forward to hour:minute on day, give or take jitter minutes."""
+        when = datetime(day.year, day.month, day.day, hour, minute)
+        when += timedelta(minutes=self.rng.randint(-jitter, jitter))
+        if when > self.clock.now():
+            self.clock.set(when)
+
+    # One day of usage
+    def run_day(self, index):
+        w, rng = self.window, self.rng
+        day = self.clock.today()
+        weekend = day.weekday() >= 5
+
+        self.at(day, 7, 15, jitter=40)
+        w.page_dashboard.log_wake()
+
+        self.at(day, 8, 45, jitter=30)
+        for _ in range(rng.choice((0, 1, 1, 2))):
+            due = self.clock.today() + timedelta(days=rng.randint(0, 14)) if rng.random() < 0.5 else None
+            w.tasks.add(f"{rng.choice(WORDS)} {rng.randint(1, 99)}",
+                        tags=rng.sample(TAGS, rng.randint(0, 2)),
+                        priority=rng.choice(PRIORITIES),
+                        due=due.isoformat() if due else None)
+        w.save_data()
+
+        for _ in range(rng.randint(0, 5) if weekend else rng.randint(3, 14)):
+            w.page_dashboard.pick_random()
+            w.sprint_running = True
+            w.remaining_seconds = app_module.SPRINT_SECONDS
+            w.run_timer()
+            self.clock.advance(minutes=rng.randint(3, 40))
+            if w.current_task is not None and rng.random() < 0.15:
+                w.tasks.complete(w.current_task.id)
+                w.current_task = None
+                w.save_data()
+
+        if day.weekday() == 6:
+            self.at(day, 20, 0, jitter=30)
+            page = w.page_review
+            page.refresh()
+            page.wins.setPlainText(f"Finished {rng.randint(5, 40)} sprints\nKept the routine")
+            page.struggles.setPlainText(rng.choice(("Mornings", "Email", "Too many meetings", "")))
+            page.improve.setPlainText("Start earlier")
+            page.priorities.setPlainText("\n".join(rng.sample(WORDS, 3)))
+            page.commit_review()
+
+        # Late nights may run past midnight
+        self.at(day, 23, 10, jitter=60)
+        w.page_dashboard.log_sleep()
+        self.measure(day)
+
+        tomorrow = day + timedelta(days=1)
+        self.clock.set(max(self.clock.now(), datetime(tomorrow.year, tomorrow.month, tomorrow.day)))
+        QApplication.processEvents()
+        if self.restart_every and (index + 1) % self.restart_every == 0:
+            self.open_window()
+
+    def measure(self, day):
+        w = self.window
+        self.days.append({
+            "day": day.isoformat(),
+            "sprints": len(w.sprint_blocks),
+            "sleep": len(w.sleep_log_data),
+            "data_bytes": os.path.getsize(self.data_path) + os.path.getsize(log_path_for(self.data_path)),
+            "archive_bytes": dir_size(os.path.join(self.directory, "archive")),
+            "save_ms": timed_ms(w.save_data),
+            "refresh_dashboard_ms": timed_ms(w.page_dashboard.refresh),
+            "refresh_review_ms": timed_ms(w.page_review.refresh),
+            "stats_ms": timed_ms(w.compute_current_week_stats),
+            "refresh_history_ms": timed_ms(w.page_history.refresh),
+        })
+
+    def run(self, days):
+        self.open_window()
+        for index in range(days):
+            self.run_day(index)
+        self.window.watchdog.stop()
+        self.window.runner.shutdown()
+        self.window.store.close()
+
+
+def weekly_rows(days):
+    for i in range(0, len(days), 7):
+        week = days[i:i + 7]
+        last = week[-1]
+        yield {
+            "week_of": week[0]["day"],
+            "hot_sprints": last["sprints"],
+            "data_kb": last["data_bytes"] / 1024,
+            "archive_kb": last["archive_bytes"] / 1024,
+            "save_ms": statistics.median(d["save_ms"] for d in week),
+            "save_max_ms": max(d["save_ms"] for d in week),
+            "dashboard_ms": statistics.median(d["refresh_dashboard_ms"] for d in week),
+            "review_ms": statistics.median(d["refresh_review_ms"] for d in week),
+            "stats_ms": statistics.median(d["stats_ms"] for d in week),
+            "history_ms": statistics.median(d["refresh_history_ms"] for d in week),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 9, 1))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--restart-every", type=int, default=30,
+                        help="rebuild the window from disk every N days (0: never)")
+    parser.add_argument("--dir", help="data directory (default: a fresh temporary one)")
+    parser.add_argument("--json", help="also write daily measurements here")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="adhd-sim-")
+    os.makedirs(directory, exist_ok=True)
+    qt_app = QApplication.instance() or QApplication([])
+
+    sim = Simulation(directory, args.start, args.seed, args.restart_every)
+    wall = time.perf_counter()
+    sim.run(args.days)
+    wall = time.perf_counter() - wall
+
+    print(f"{'week of':<12}{'sprints':>8}{'data KB':>9}{'arch KB':>9}{'save':>8}{'max':>8}"
+          f"{'dash':>8}{'review':>8}{'stats':>8}{'history':>8}   (ms)")
+    for row in weekly_rows(sim.days):
+        print(f"{row['week_of']:<12}{row['hot_sprints']:>8}{row['data_kb']:>9.1f}"
+              f"{row['archive_kb']:>9.1f}{row['save_ms']:>8.2f}{row['save_max_ms']:>8.2f}"
+              f"{row['dashboard_ms']:>8.2f}{row['review_ms']:>8.2f}{row['stats_ms']:>8.2f}"
+              f"{row['history_ms']:>8.2f}")
+    print("startups: " + ", ".join(f"{day} {ms:.0f} ms" for day, ms in sim.startups))
+    print(f"simulated {args.days} days in {wall:.1f} s; data in {directory}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"days": sim.days, "startups": [(d.isoformat(), ms) for d, ms in sim.startups]},
+                      f, indent=1)
+    qt_app.quit()
+
+
+if __name__ == "__main__":
+    main()
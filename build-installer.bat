@@ -22,6 +22,16 @@ if exist dist rmdir /s /q dist
 if exist build rmdir /s /q build
 echo.
 
+REM Compile icons and stylesheets into the Qt resource bundle
+echo Compiling assets.rcc...
+python assets.py build
+if %errorlevel% neq 0 (
+    echo Failed to compile assets.rcc
+    pause
+    exit /b 1
+)
+echo.
+
 REM Run PyInstaller
 echo ========================================
 echo   Step 1: Building Executable
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry.
+
+    Unlike functools.lru_cache, entries can be invalidated one key at a
+    time, and ``on_evict(key, value)`` lets owners release resources
+    (e.g. Qt objects) held by entries that fall out.
+    """
+
+    def __init__(self, maxsize, on_evict=None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key, value):
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            old_key, old_value = self._data.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(old_key, old_value)
+
+    def invalidate(self, key):
+        value = self._data.pop(key, None)
+        if value is not None and self.on_evict:
+            self.on_evict(key, value)
+
+    def clear(self):
+        while self._data:
+            key, value = self._data.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(key, value)
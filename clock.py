@@ -0,0 +1,68 @@
+"""Where the app gets the time from.
+
+Everything that stamps or waits (the sprint timer, sleep logging, task
+dates, week boundaries, sync ops) asks a clock instead of calling
+datetime.now(), date.today() or time.sleep() itself. The app runs on
+SYSTEM_CLOCK; benchmarks/simulate.py passes a SimulatedClock to run months of
+usage in seconds.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    def now(self):
+        return datetime.now()
+
+    def today(self):
+        return datetime.now().date()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """A clock that only moves when told to.
+
+    With ``auto_advance`` (the default), ``sleep()`` returns immediately
+    after moving the clock forward, so a 5 minute sprint "runs" instantly.
+    Without it, ``sleep()`` blocks until another thread calls ``advance()``
+    far enough, which lets a harness step timer threads deterministically.
+    """
+
+    def __init__(self, start=None, auto_advance=True):
+        self._now = start or datetime(2026, 1, 5, 8, 0)
+        self.auto_advance = auto_advance
+        self._cond = threading.Condition()
+
+    def now(self):
+        with self._cond:
+            return self._now
+
+    def today(self):
+        return self.now().date()
+
+    def advance(self, seconds=0, **delta):
+        """Move forward by seconds (or timedelta keywords, e.g. days=1)."""
+        with self._cond:
+            self._now += timedelta(seconds=seconds, **delta)
+            self._cond.notify_all()
+
+    def set(self, when):
+        with self._cond:
+            if when < self._now:
+                raise ValueError("a simulated clock never runs backwards")
+            self._now = when
+            self._cond.notify_all()
+
+    def sleep(self, seconds):
+        if self.auto_advance:
+            self.advance(seconds)
+            return
+        with self._cond:
+            wake_at = self._now + timedelta(seconds=seconds)
+            self._cond.wait_for(lambda: self._now >= wake_at)
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,54 @@
+"""Autosaved weekly review drafts, one small file per field.
+
+Typing into a review box only rewrites that field's file, e.g.
+``drafts/2026-10-19/wins.txt``, never data.json. Saving the review promotes
+the drafts into weekly_reviews and deletes them.
+"""
+import os
+import shutil
+
+from storage import path_next_to
+
+DRAFTS_DIR = "drafts"
+
+
+def drafts_dir_for(data_path):
+    return path_next_to(data_path, DRAFTS_DIR)
+
+
+class DraftStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _week_dir(self, week_start):
+        return os.path.join(self.directory, week_start)
+
+    def write(self, week_start, field, text):
+        week_dir = self._week_dir(week_start)
+        os.makedirs(week_dir, exist_ok=True)
+        path = os.path.join(week_dir, f"{field}.txt")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def load(self, week_start):
+        """Return {field: text} for every field with a draft this week."""
+        week_dir = self._week_dir(week_start)
+        try:
+            names = os.listdir(week_dir)
+        except FileNotFoundError:
+            return {}
+        drafts = {}
+        for name in names:
+            field, ext = os.path.splitext(name)
+            if ext == ".txt":
+                with open(os.path.join(week_dir, name), "r", encoding="utf-8") as f:
+                    drafts[field] = f.read()
+        return drafts
+
+    def clear(self, week_start):
+        shutil.rmtree(self._week_dir(week_start), ignore_errors=True)
+
+    def clear_all(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
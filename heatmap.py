@@ -0,0 +1,188 @@
+"""GitHub-style calendar heatmap of sprints or sleep entries per day.
+
+Columns are weeks (newest on the right), rows are weekdays. Cells are not
+painted one by one on every paintEvent: each month is rendered once into a
+pixmap tile and the paint just blits the tiles for the months in view. A
+month's tile is only re-rendered when that month's counts change (or the
+cell size / DPR changes, or the month is the current one and a day passes).
+Colour levels use fixed thresholds rather than the visible maximum, so a busy
+day in one month never forces the other months to be redrawn.
+
+Hover tooltips are answered from a per-day index built in set_counts().
+"""
+from datetime import date, timedelta
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+from PySide6.QtWidgets import QToolTip, QWidget
+
+from perf import perf
+
+CELL = 11
+GAP = 2
+STEP = CELL + GAP
+LEFT = 28
+TOP = 16
+MAX_WEEKS = 53
+
+EMPTY_COLOR = QColor(148, 163, 184, 30)
+LEVELS = {
+    # Lower bounds for colour levels 1..4
+    "sprints": ((1, 3, 6, 10), (59, 130, 246)),
+    "sleep": ((1, 2, 3, 4), (167, 139, 250)),
+}
+WEEKDAY_LABELS = {0: "Mon", 2: "Wed", 4: "Fri"}
+
+
+def month_key(d):
+    return (d.year, d.month)
+
+
+def month_days(year, month):
+    d = date(year, month, 1)
+    while d.month == month:
+        yield d
+        d += timedelta(days=1)
+
+
+class CalendarHeatmap(QWidget):
+    def __init__(self, today, mode="sprints", parent=None):
+        super().__init__(parent)
+        self.mode = mode
+        self.today = today
+        self._index = {}
+        self._months = {}
+        self._tiles = {}
+        self.setMouseTracking(True)
+        self.setMinimumHeight(TOP + 7 * STEP + GAP)
+        self.setMaximumHeight(TOP + 7 * STEP + GAP)
+
+    # Data
+    def set_counts(self, sprints_per_day, sleep_per_day, today):
+        """Counts are {ISO date: n}; only months whose counts changed are redrawn."""
+        if today != self.today:
+            self._drop_tiles(month_key(self.today))
+            self.today = today
+        index = {}
+        for day, n in sprints_per_day.items():
+            index[day] = (n, 0)
+        for day, n in sleep_per_day.items():
+            index[day] = (index.get(day, (0, 0))[0], n)
+
+        months = {}
+        for day in sorted(index):
+            months.setdefault((int(day[:4]), int(day[5:7])), []).append((day, index[day]))
+        months = {key: tuple(days) for key, days in months.items()}
+
+        for key in self._months.keys() | months.keys():
+            if self._months.get(key) != months.get(key):
+                self._drop_tiles(key)
+        self._index = index
+        self._months = months
+        self.update()
+
+    def set_mode(self, mode):
+        if mode != self.mode:
+            self.mode = mode
+            self.update()
+
+    def _drop_tiles(self, month):
+        for key in [k for k in self._tiles if k[0] == month]:
+            del self._tiles[key]
+
+    # Layout
+    def _weeks(self):
+        return max(1, min(MAX_WEEKS, (self.width() - LEFT) // STEP))
+
+    def _first_monday(self):
+        this_monday = self.today - timedelta(days=self.today.weekday())
+        return this_monday - timedelta(weeks=self._weeks() - 1)
+
+    def _column(self, d):
+        return (d - self._first_monday()).days // 7
+
+    def _level(self, n):
+        thresholds, _ = LEVELS[self.mode]
+        return sum(1 for t in thresholds if n >= t)
+
+    def _color(self, level):
+        if level == 0:
+            return EMPTY_COLOR
+        _, (r, g, b) = LEVELS[self.mode]
+        return QColor(r, g, b, 60 + 195 * level // 4)
+
+    # Tiles
+    def _tile(self, year, month):
+        """Pixmap of one month's cells; column 0 is the week of the 1st."""
+        dpr = self.devicePixelRatioF()
+        # The current month's tile also depends on which days have happened
+        current = self.today if month_key(self.today) == (year, month) else None
+        key = ((year, month), self.mode, dpr, current)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            return tile
+
+        first = date(year, month, 1)
+        first_monday = first - timedelta(days=first.weekday())
+        columns = 6
+        tile = QPixmap(int(columns * STEP * dpr), int(7 * STEP * dpr))
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        slot = 0 if self.mode == "sprints" else 1
+        for d in month_days(year, month):
+            if d > self.today:
+                break
+            n = self._index.get(d.isoformat(), (0, 0))[slot]
+            painter.setBrush(self._color(self._level(n)))
+            col = (d - first_monday).days // 7
+            painter.drawRoundedRect(col * STEP, d.weekday() * STEP, CELL, CELL, 2, 2)
+        painter.end()
+        self._tiles[key] = tile
+        return tile
+
+    @perf.timed("paint.heatmap")
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        first_monday = self._first_monday()
+        weeks = self._weeks()
+
+        font = QFont()
+        font.setPointSize(7)
+        painter.setFont(font)
+        painter.setPen(QColor(156, 163, 175))
+        for row, label in WEEKDAY_LABELS.items():
+            painter.drawText(0, TOP + row * STEP + CELL - 1, label)
+
+        painter.setClipRect(QRect(LEFT, 0, weeks * STEP, self.height()))
+        year, month = first_monday.year, first_monday.month
+        while (year, month) <= month_key(self.today):
+            first = date(year, month, 1)
+            col = self._column(first - timedelta(days=first.weekday()))
+            x = LEFT + col * STEP
+            painter.drawPixmap(x, TOP, self._tile(year, month))
+            if col >= 0:
+                painter.drawText(x, TOP - 4, first.strftime("%b"))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        painter.end()
+
+    def cell_at(self, pos):
+        col = (pos.x() - LEFT) // STEP
+        row = (pos.y() - TOP) // STEP
+        if not (0 <= col < self._weeks() and 0 <= row < 7):
+            return None
+        d = self._first_monday() + timedelta(weeks=col, days=row)
+        return d if d <= self.today else None
+
+    def mouseMoveEvent(self, event):
+        d = self.cell_at(event.position().toPoint())
+        if d is None:
+            QToolTip.hideText()
+            return
+        sprints, sleep = self._index.get(d.isoformat(), (0, 0))
+        text = (f"{d.strftime('%a %b %d, %Y')}\n"
+                f"{sprints} sprint{'s' if sprints != 1 else ''}, "
+                f"{sleep} sleep log{'s' if sleep != 1 else ''}")
+        QToolTip.showText(event.globalPosition().toPoint(), text, self)
@@ -0,0 +1,191 @@
+"""Lightweight timing spans, rolling histograms and a GUI-thread stall watchdog.
+
+Spans are recorded into a process-wide registry:
+
+    @perf.timed("storage.save")
+    def save_data(self): ...
+
+    with perf.span("stats.week"):
+        ...
+
+The watchdog needs a heartbeat from the event loop (a QTimer calling
+``beat``). A monitor thread notices when the heartbeat stops for longer
+than the threshold and grabs the GUI thread's Python stack while it is
+still blocked, so the stall report shows what was actually running.
+Both wake up every few tens of milliseconds, so stop the watchdog (and its
+heartbeat) while nobody is looking at the window.
+"""
+import functools
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+
+from clock import SYSTEM_CLOCK
+
+HISTOGRAM_SAMPLES = 512
+MAX_STALLS = 50
+
+
+class RollingHistogram:
+    """The last few hundred durations (ms) of one span, plus lifetime totals."""
+
+    def __init__(self, maxlen=HISTOGRAM_SAMPLES):
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "recent_ms": list(self.samples),
+        }
+
+
+class PerfRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self._lock = threading.Lock()
+
+    def record(self, name, ms):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = RollingHistogram()
+            hist.add(ms)
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_stall(self, stall):
+        with self._lock:
+            self.stalls.append(stall)
+
+    def summary_lines(self):
+        """One line per span, slowest p95 first, for the overlay."""
+        with self._lock:
+            rows = [(name, h.snapshot()) for name, h in self.histograms.items()]
+            stalls = list(self.stalls)
+        rows.sort(key=lambda r: r[1]["p95_ms"], reverse=True)
+        lines = [f"{'span':<22}{'n':>6}{'p50':>8}{'p95':>8}{'max':>8}"]
+        for name, snap in rows:
+            lines.append(
+                f"{name:<22}{snap['count']:>6}{snap['p50_ms']:>8.1f}"
+                f"{snap['p95_ms']:>8.1f}{snap['max_ms']:>8.1f}"
+            )
+        lines.append(f"stalls: {len(stalls)}")
+        if stalls:
+            last = stalls[-1]
+            where = last["stack"][-1].strip().splitlines()[0] if last["stack"] else "?"
+            lines.append(f"last: {last['duration_ms']:.0f} ms at {where}")
+        return lines
+
+    def dump(self, path, written):
+        with self._lock:
+            data = {
+                "written": written.isoformat(),
+                "spans": {name: h.snapshot() for name, h in self.histograms.items()},
+                "stalls": list(self.stalls),
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+perf = PerfRegistry()
+
+
+class StallWatchdog:
+    """Reports GUI-thread blocks longer than threshold_ms, with their stack."""
+
+    def __init__(self, registry=perf, threshold_ms=150, interval_ms=50, clock=None):
+        self.registry = registry
+        self.clock = clock or SYSTEM_CLOCK
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.gui_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._current_stall = None
+        self._stop = None
+
+    @property
+    def running(self):
+        return self._stop is not None
+
+    def beat(self):
+        """Call from the GUI thread on a timer every interval_ms."""
+        now = time.perf_counter()
+        late_ms = (now - self._last_beat - self.interval) * 1000
+        self.registry.record("eventloop.latency", max(late_ms, 0.0))
+        stall = self._current_stall
+        if stall is not None:
+            stall["duration_ms"] = (now - self._last_beat) * 1000
+            self._current_stall = None
+        self._last_beat = now
+
+    def start(self):
+        if self._stop is not None:
+            return
+        # Time spent stopped is not a stall
+        self._last_beat = time.perf_counter()
+        self._current_stall = None
+        self._stop = threading.Event()
+        threading.Thread(target=self._monitor, args=(self._stop,), daemon=True,
+                         name="stall-watchdog").start()
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def _monitor(self, stop):
+        while not stop.wait(self.interval / 2):
+            last = self._last_beat
+            blocked = time.perf_counter() - last
+            if blocked < self.threshold or self._current_stall is not None:
+                continue
+            frame = sys._current_frames().get(self.gui_thread_id)
+            stall = {
+                "at": self.clock.now().isoformat(),
+                "duration_ms": blocked * 1000,
+                "stack": traceback.format_stack(frame) if frame is not None else [],
+            }
+            self.registry.add_stall(stall)
+            # If the loop recovered while we were sampling, the stall is over
+            if self._last_beat == last:
+                self._current_stall = stall
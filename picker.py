@@ -0,0 +1,177 @@
+import random
+import threading
+from collections import deque
+from datetime import datetime, date
+
+PRIORITY_WEIGHTS = {"low": 1.0, "normal": 2.0, "high": 4.0, "urgent": 8.0}
+RECENT_PICK_PENALTY = 0.1
+RECENT_SPRINT_PENALTY = 0.5
+
+
+class FenwickTree:
+    """Binary indexed tree over slot weights: O(log n) update, prefix sum and search."""
+
+    def __init__(self, size=0):
+        self.size = size
+        self.tree = [0.0] * (size + 1)
+
+    def add(self, index, delta):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self):
+        i, result = self.size, 0.0
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, target):
+        """Return the first slot whose prefix sum exceeds target."""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+    @classmethod
+    def build(cls, weights):
+        fenwick = cls(len(weights))
+        fenwick.tree[1:] = weights
+        for i in range(1, fenwick.size + 1):
+            parent = i + (i & -i)
+            if parent <= fenwick.size:
+                fenwick.tree[parent] += fenwick.tree[i]
+        return fenwick
+
+
+class TaskPicker:
+    """Weighted "what next" picker kept in step with a TaskStore.
+
+    Every active task owns a slot in a Fenwick tree holding its weight, so a
+    pick is a single O(log n) descent and store changes only touch the slot
+    of the task that changed. Weights that depend on the calendar (age, due
+    date) are refreshed once per day rather than on every click.
+    """
+
+    def __init__(self, store, rng=None, recent_size=3, clock=None):
+        self.store = store
+        self.clock = clock or store.clock
+        self.rng = rng or random.Random()
+        self.recent = deque(maxlen=recent_size)
+        self._lock = threading.Lock()
+        self._rebuild()
+        store.subscribe(self._on_store_change)
+
+    def weight(self, task, today):
+        w = PRIORITY_WEIGHTS.get(task.priority, 2.0)
+
+        created = datetime.fromisoformat(task.created).date()
+        age_days = max((today - created).days, 0)
+        w *= 1.0 + min(age_days, 30) / 10
+
+        if task.due:
+            days_left = (date.fromisoformat(task.due) - today).days
+            if days_left < 0:
+                w *= 4.0
+            elif days_left == 0:
+                w *= 3.0
+            elif days_left <= 3:
+                w *= 2.0
+            elif days_left <= 7:
+                w *= 1.5
+
+        # Spread attention: a task that just had a sprint can wait a little
+        if task.last_sprint:
+            if datetime.fromisoformat(task.last_sprint).date() >= today:
+                w *= RECENT_SPRINT_PENALTY
+
+        if task.id in self.recent:
+            w *= RECENT_PICK_PENALTY
+        return w
+
+    def _rebuild(self):
+        self._today = self.clock.today()
+        self._slots = {}
+        self._weights = []
+        self._free = []
+        for task in self.store:
+            self._slots[task.id] = len(self._weights)
+            self._weights.append(self.weight(task, self._today))
+        self._task_ids = list(self._slots)
+        self._tree = FenwickTree.build(list(self._weights))
+
+    def _grow(self):
+        old = len(self._weights)
+        new = max(8, old * 2)
+        self._weights.extend([0.0] * (new - old))
+        self._task_ids.extend([None] * (new - old))
+        self._free.extend(range(new - 1, old - 1, -1))
+        self._tree = FenwickTree.build(list(self._weights))
+
+    def _set_weight(self, slot, weight):
+        self._tree.add(slot, weight - self._weights[slot])
+        self._weights[slot] = weight
+
+    def _refresh_task(self, task_id):
+        slot = self._slots.get(task_id)
+        task = self.store.get(task_id)
+        if slot is not None and task is not None:
+            self._set_weight(slot, self.weight(task, self._today))
+
+    def _on_store_change(self, event, task):
+        with self._lock:
+            if event == "reset":
+                self.recent.clear()
+                self._rebuild()
+            elif event == "add":
+                if not self._free:
+                    self._grow()
+                slot = self._free.pop()
+                self._slots[task.id] = slot
+                self._task_ids[slot] = task.id
+                self._set_weight(slot, self.weight(task, self._today))
+            elif event == "update":
+                self._refresh_task(task.id)
+            elif event in ("remove", "discard"):
+                slot = self._slots.pop(task.id, None)
+                if slot is not None:
+                    self._set_weight(slot, 0.0)
+                    self._task_ids[slot] = None
+                    self._free.append(slot)
+
+    def pick(self):
+        """Sample one active task proportionally to its weight, or None."""
+        with self._lock:
+            if self.clock.today() != self._today:
+                # Rebuilding also clears any floating point drift in the tree
+                self._rebuild()
+
+            total = self._tree.total()
+            if total <= 0:
+                return None
+            slot = self._tree.find(self.rng.random() * total)
+            slot = min(slot, len(self._task_ids) - 1)
+            task_id = self._task_ids[slot]
+            if task_id is None:
+                # Rounding can land on an empty slot; fall back to a rebuild
+                self._rebuild()
+                total = self._tree.total()
+                if total <= 0:
+                    # The drift was all that was left: nothing to pick
+                    return None
+                slot = self._tree.find(self.rng.random() * total)
+                task_id = self._task_ids[min(slot, len(self._task_ids) - 1)]
+
+            dropped = self.recent[0] if len(self.recent) == self.recent.maxlen else None
+            self.recent.append(task_id)
+            self._refresh_task(task_id)
+            if dropped is not None and dropped not in self.recent:
+                self._refresh_task(dropped)
+            return self.store.get(task_id)
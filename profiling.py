@@ -0,0 +1,143 @@
+"""On-demand profiling of the running app, started and stopped from the tray.
+
+A session combines three views of the same time window:
+
+- cProfile on the GUI thread, written as ``.pstats`` (snakeviz, pstats,
+  ``python -m pstats``),
+- a sampling profiler over all threads, written as folded stacks
+  (``.folded``) that flamegraph.pl, speedscope or inferno read directly,
+- the allocation sites that grew most during the session, from tracemalloc
+  snapshots taken at start and stop (``.tracemalloc.txt``).
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from clock import SYSTEM_CLOCK
+from storage import path_next_to
+
+PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 25
+TOP_ALLOCATIONS = 30
+
+
+def profile_dir_for(data_path):
+    return path_next_to(data_path, PROFILE_DIR)
+
+
+def _folded_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        names.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples every thread's Python stack into folded-stack counts."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        while self._running:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                thread_name = names.get(ident, str(ident)).replace(";", "_").replace(" ", "_")
+                self.counts[f"{thread_name};{_folded_stack(frame)}"] += 1
+            time.sleep(self.interval)
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilerSession:
+    def __init__(self, output_dir, clock=None):
+        self.output_dir = output_dir
+        self.clock = clock or SYSTEM_CLOCK
+        self.profile = None
+        self.sampler = None
+        self.started = None
+        self.baseline = None
+        self._owns_tracemalloc = False
+
+    @property
+    def running(self):
+        return self.profile is not None
+
+    def start(self):
+        """Start profiling; cProfile covers the calling (GUI) thread."""
+        self.started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        # Allocations made before the session aren't what it is looking at
+        self.baseline = tracemalloc.take_snapshot()
+        self.sampler = StackSampler()
+        self.sampler.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        """Stop profiling and write the outputs; returns the written paths."""
+        self.profile.disable()
+        self.sampler.stop()
+        elapsed = time.perf_counter() - self.started
+        # Snapshot before writing anything so our own output isn't counted
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, "profile-" + self.clock.now().strftime("%Y%m%d-%H%M%S"))
+        paths = [base + ".pstats", base + ".folded", base + ".tracemalloc.txt"]
+
+        self.profile.dump_stats(paths[0])
+        self.sampler.write(paths[1])
+
+        filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+        growth = snapshot.filter_traces(filters).compare_to(
+            self.baseline.filter_traces(filters), "lineno")
+        with open(paths[2], "w", encoding="utf-8") as f:
+            f.write(f"Session length: {elapsed:.1f} s\n")
+            f.write(f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n\n")
+            f.write(f"Top {TOP_ALLOCATIONS} allocation sites by growth since the session started:\n")
+            for stat in growth[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+        self.profile = None
+        self.sampler = None
+        self.baseline = None
+        return paths
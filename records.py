@@ -0,0 +1,393 @@
+"""Compact in-memory collections for sprints, sleep entries and reviews.
+
+A tray app that never quits keeps its whole hot history resident, and as
+Python objects a sprint timestamp costs ~80 bytes (a str plus a list slot)
+and a review ~1 KB of dict. These types keep the same interface the rest of
+the app already uses, but store records compactly:
+
+- ``SprintLog`` is a list of ISO timestamp strings backed by one int64
+  (microseconds since 1970) per sprint.
+- ``SleepLog`` is a list of "Sleep at YYYY-mm-dd HH:MM" strings backed by
+  one int64 per entry: minutes since 1970 plus an interned event kind.
+- ``ReviewList`` holds ``Review`` objects: ``__slots__`` records that read
+  like the review dicts they replace.
+
+Strings are rebuilt on access. Anything that wouldn't come back
+byte-for-byte (a timezone, an unusual format) is kept verbatim on the side,
+so sync and import, which compare strings, see exactly what was stored.
+"""
+import sys
+from abc import abstractmethod
+from array import array
+from collections import Counter
+from collections.abc import Mapping, MutableSequence
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DAY = EPOCH.toordinal()
+KIND_BITS = 8
+US_PER_DAY = 86400 * 1_000_000
+
+
+@lru_cache(maxsize=4096)
+def _day(days):
+    """ISO date for a day number since 1970; rebuilding strings is mostly this."""
+    return date.fromordinal(EPOCH_DAY + days).isoformat()
+
+
+class _EncodedLog(MutableSequence):
+    """A list of strings stored as one int64 code each."""
+
+    __slots__ = ("_codes", "_odd")
+
+    def __init__(self, items=()):
+        self._codes = array("q")
+        self._odd = {}  # index -> strings that don't round-trip
+        self.extend(items)
+
+    @abstractmethod
+    def _encode(self, value):
+        """The int64 code for a value; may raise or return None if it has none."""
+
+    @abstractmethod
+    def _decode(self, code):
+        """The string a code stands for."""
+
+    def _lookup(self, value):
+        """Like ``_encode``, but for reads: never adds to any lookup table."""
+        return self._encode(value)
+
+    def _code_for(self, value, encode=None):
+        try:
+            code = (encode or self._encode)(value)
+        except (ValueError, TypeError, OverflowError):
+            return None
+        if code is None or self._decode(code) != value:
+            return None
+        return code
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._codes)
+        code = self._codes[index]
+        if self._odd:
+            odd = self._odd.get(index)
+            if odd is not None:
+                return odd
+        return self._decode(code)
+
+    def __iter__(self):
+        if not self._odd:
+            decode = self._decode
+            for code in self._codes:
+                yield decode(code)
+        else:
+            for i in range(len(self._codes)):
+                yield self[i]
+
+    def __contains__(self, value):
+        code = self._code_for(value, self._lookup)
+        if code is None:
+            return value in self._odd.values()
+        if not self._odd:
+            return code in self._codes
+        return any(c == code and i not in self._odd for i, c in enumerate(self._codes))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, _EncodedLog)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def append(self, value):
+        code = self._code_for(value)
+        if code is None:
+            self._odd[len(self._codes)] = value
+            code = 0
+        self._codes.append(code)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = list(value)
+            self._reset(items)
+            return
+        if index < 0:
+            index += len(self._codes)
+        code = self._code_for(value)
+        self._odd.pop(index, None)
+        if code is None:
+            self._odd[index] = value
+            code = 0
+        self._codes[index] = code
+
+    def __delitem__(self, index):
+        if isinstance(index, int) and not self._odd:
+            del self._codes[index]
+            return
+        items = list(self)
+        del items[index]
+        self._reset(items)
+
+    def insert(self, index, value):
+        items = list(self)
+        items.insert(index, value)
+        self._reset(items)
+
+    def clear(self):
+        self._reset(())
+
+    def _reset(self, items):
+        self._codes = array("q")
+        self._odd = {}
+        self.extend(items)
+
+    # Queries straight on the codes, without rebuilding strings
+    @abstractmethod
+    def _bound(self, dt):
+        """The smallest code at or after a naive datetime."""
+
+    @abstractmethod
+    def _day_number(self, code):
+        """Days since 1970 of the record a code stands for."""
+
+    @abstractmethod
+    def _to_datetime(self, code):
+        """The naive datetime of the record a code stands for."""
+
+    @abstractmethod
+    def _odd_datetime(self, value):
+        """The naive datetime of a verbatim string, or None."""
+
+    def datetimes_between(self, start, end):
+        """Naive datetimes of the records with start <= t < end."""
+        lo, hi = self._bound(start), self._bound(end)
+        if not self._odd:
+            return [self._to_datetime(c) for c in self._codes if lo <= c < hi]
+        result = [self._to_datetime(c) for i, c in enumerate(self._codes)
+                  if lo <= c < hi and i not in self._odd]
+        for value in self._odd.values():
+            dt = self._odd_datetime(value)
+            if dt is not None and start <= dt < end:
+                result.append(dt)
+        return result
+
+    def day_counts(self):
+        """Counter of records per ISO day."""
+        numbers = Counter(map(self._day_number, self._codes))
+        counts = Counter({_day(n): c for n, c in numbers.items()})
+        if self._odd:
+            for i, value in self._odd.items():
+                counts[_day(self._day_number(self._codes[i]))] -= 1
+                dt = self._odd_datetime(value)
+                if dt is not None:
+                    counts[dt.date().isoformat()] += 1
+            counts = +counts
+        return counts
+
+    def copy(self):
+        new = type(self).__new__(type(self))
+        new._codes = array("q", self._codes)
+        new._odd = dict(self._odd)
+        return new
+
+    def to_list(self):
+        return list(self)
+
+    def nbytes(self):
+        return (sys.getsizeof(self) + sys.getsizeof(self._codes) + sys.getsizeof(self._odd)
+                + sum(sys.getsizeof(s) for s in self._odd.values()))
+
+
+class SprintLog(_EncodedLog):
+    """Sprint end times as ISO strings, stored as microseconds since 1970."""
+
+    __slots__ = ()
+
+    def _encode(self, ts):
+        return self._bound(datetime.fromisoformat(ts))
+
+    def _bound(self, dt):
+        delta = dt - EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+    def _day_number(self, code):
+        return code // US_PER_DAY
+
+    def _to_datetime(self, code):
+        return EPOCH + timedelta(microseconds=code)
+
+    def _odd_datetime(self, value):
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            return None
+
+    def _decode(self, code):
+        # Same output as datetime.isoformat(), without building a datetime
+        days, us = divmod(code, US_PER_DAY)
+        seconds, us = divmod(us, 1_000_000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        if us:
+            return f"{_day(days)}T{hours:02d}:{minutes:02d}:{seconds:02d}.{us:06d}"
+        return f"{_day(days)}T{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class SleepLog(_EncodedLog):
+    """"<Kind> at YYYY-mm-dd HH:MM" entries, stored as minutes since 1970
+    shifted left by KIND_BITS, with the kind as an index into a small table."""
+
+    __slots__ = ("_kinds", "_kind_ids")
+
+    def __init__(self, items=()):
+        self._kinds = []
+        self._kind_ids = {}
+        super().__init__(items)
+
+    def _encode(self, entry, add=True):
+        kind, sep, stamp = entry.partition(" at ")
+        if not sep or len(stamp) != 16:
+            return None
+        delta = datetime.fromisoformat(stamp) - EPOCH
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            if not add or len(self._kinds) >= 1 << KIND_BITS:
+                return None
+            kind_id = self._kind_ids[kind] = len(self._kinds)
+            self._kinds.append(sys.intern(kind))
+        return (delta.days * 1440 + delta.seconds // 60) << KIND_BITS | kind_id
+
+    def _lookup(self, entry):
+        return self._encode(entry, add=False)
+
+    def _bound(self, dt):
+        delta = dt - EPOCH
+        # Any kind sorts after the start of its minute
+        return -(-(delta.days * 86400 + delta.seconds) // 60) << KIND_BITS
+
+    def _day_number(self, code):
+        return (code >> KIND_BITS) // 1440
+
+    def _to_datetime(self, code):
+        return EPOCH + timedelta(minutes=code >> KIND_BITS)
+
+    def _odd_datetime(self, value):
+        try:
+            return datetime.fromisoformat(value.split(" at ")[1][:16])
+        except (IndexError, ValueError):
+            return None
+
+    def _decode(self, code):
+        minutes, kind_id = code >> KIND_BITS, code & ((1 << KIND_BITS) - 1)
+        days, minutes = divmod(minutes, 1440)
+        hours, minutes = divmod(minutes, 60)
+        return f"{self._kinds[kind_id]} at {_day(days)} {hours:02d}:{minutes:02d}"
+
+    def copy(self):
+        new = super().copy()
+        new._kinds = list(self._kinds)
+        new._kind_ids = dict(self._kind_ids)
+        return new
+
+
+REVIEW_FIELDS = ("week_start", "wins", "struggles", "improvements", "priorities", "updated")
+_MISSING = object()
+
+
+class Review(Mapping):
+    """A weekly review with fixed slots; reads like the dict it replaces.
+
+    Keys outside REVIEW_FIELDS (e.g. from an import) are kept in ``extra``.
+    """
+
+    __slots__ = REVIEW_FIELDS + ("extra",)
+
+    def __init__(self, fields=()):
+        for name in REVIEW_FIELDS:
+            setattr(self, name, _MISSING)
+        self.extra = None
+        for key, value in dict(fields).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in REVIEW_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in REVIEW_FIELDS:
+            setattr(self, key, sys.intern(value) if key == "week_start" else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self):
+        for name in REVIEW_FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Review({dict(self)!r})"
+
+    def to_dict(self):
+        return dict(self)
+
+
+class ReviewList(list):
+    """A list that stores every review it is given as a Review."""
+
+    def __init__(self, items=()):
+        super().__init__(self._wrap(r) for r in items)
+
+    @staticmethod
+    def _wrap(review):
+        return review if isinstance(review, Review) else Review(review)
+
+    def append(self, review):
+        super().append(self._wrap(review))
+
+    def extend(self, reviews):
+        super().extend(self._wrap(r) for r in reviews)
+
+    def insert(self, index, review):
+        super().insert(index, self._wrap(review))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._wrap(r) for r in value]
+        else:
+            value = self._wrap(value)
+        super().__setitem__(index, value)
+
+    def __iadd__(self, reviews):
+        self.extend(reviews)
+        return self
+
+    def copy(self):
+        return ReviewList(self)
+
+    def to_list(self):
+        return [review.to_dict() for review in self]
@@ -0,0 +1,137 @@
+"""Rendering backends: acrylic translucency or an opaque low-power mode.
+
+The acrylic backend makes the whole window translucent and asks DWM to blur
+what is behind it, so every repaint is alpha-composited against the
+desktop. The opaque backend paints a solid background instead and ticks
+once per countdown second, just after it changes, which is much cheaper and also works where acrylic doesn't
+exist (anything but Windows 10+).
+
+The mode is "auto", "acrylic" or "opaque". Auto picks opaque on battery
+power or when acrylic is unsupported. ADHD_CENTRAL_RENDER overrides the
+saved setting.
+"""
+import ctypes
+import glob
+import os
+import sys
+
+from PySide6.QtGui import QColor, QPalette, Qt
+
+import acrylic
+
+RENDER_MODES = ("auto", "acrylic", "opaque")
+RENDER_ENV = "ADHD_CENTRAL_RENDER"
+
+
+def on_battery():
+    """Best-effort check; False when the power source can't be determined."""
+    if sys.platform == "win32":
+        class SYSTEM_POWER_STATUS(ctypes.Structure):
+            _fields_ = [
+                ("ACLineStatus", ctypes.c_ubyte),
+                ("BatteryFlag", ctypes.c_ubyte),
+                ("BatteryLifePercent", ctypes.c_ubyte),
+                ("SystemStatusFlag", ctypes.c_ubyte),
+                ("BatteryLifeTime", ctypes.c_ulong),
+                ("BatteryFullLifeTime", ctypes.c_ulong),
+            ]
+        status = SYSTEM_POWER_STATUS()
+        if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+            return False
+        return status.ACLineStatus == 0
+
+    if sys.platform.startswith("linux"):
+        for supply in glob.glob("/sys/class/power_supply/*"):
+            try:
+                with open(os.path.join(supply, "type")) as f:
+                    kind = f.read().strip()
+                with open(os.path.join(supply, "online" if kind == "Mains" else "status")) as f:
+                    value = f.read().strip()
+            except OSError:
+                continue
+            if kind == "Mains":
+                return value == "0"
+            if kind == "Battery" and value == "Discharging":
+                return True
+    return False
+
+
+class RenderBackend:
+    name = ""
+    translucent = False
+    tick_interval_ms = 200
+
+    def prepare(self, widget):
+        """Set up a page or container widget for this backend."""
+        widget.setAutoFillBackground(False)
+        widget.setStyleSheet("background: transparent;")
+
+    def prepare_window(self, window):
+        """Set up a top-level window (main window or dialog) before it is shown."""
+
+    def apply(self, window):
+        """Called once the native window exists."""
+
+    def next_tick_ms(self, until_step_ms):
+        """Delay before the next timer repaint check.
+
+        ``until_step_ms`` is how long until the countdown next steps, or None
+        when no sprint is running.
+        """
+        return self.tick_interval_ms
+
+
+class AcrylicBackend(RenderBackend):
+    name = "acrylic"
+    translucent = True
+    tick_interval_ms = 200
+
+    def prepare(self, widget):
+        widget.setAttribute(Qt.WA_TranslucentBackground)
+        super().prepare(widget)
+
+    def prepare_window(self, window):
+        self.prepare(window)
+
+    def apply(self, window):
+        acrylic.enable_acrylic(window.winId().__int__(), 0x80282828)
+
+
+class OpaqueBackend(RenderBackend):
+    name = "opaque"
+    translucent = False
+    # The countdown only changes once a second
+    tick_interval_ms = 1000
+    tick_margin_ms = 5
+    background = QColor(17, 24, 39)
+
+    def next_tick_ms(self, until_step_ms):
+        # A free-running 1 s tick drifts against the countdown and now and
+        # then lands just before a step, showing one second twice and then
+        # skipping the next; wake just after each step instead
+        if until_step_ms is None:
+            return self.tick_interval_ms
+        return until_step_ms + self.tick_margin_ms
+
+    def prepare_window(self, window):
+        palette = window.palette()
+        palette.setColor(QPalette.Window, self.background)
+        window.setPalette(palette)
+        window.setAutoFillBackground(True)
+
+
+def resolve_mode(mode):
+    mode = os.environ.get(RENDER_ENV) or mode or "auto"
+    if mode not in RENDER_MODES:
+        mode = "auto"
+    if mode == "auto":
+        return "acrylic" if acrylic.is_supported() and not on_battery() else "opaque"
+    if mode == "acrylic" and not acrylic.is_supported():
+        return "opaque"
+    return mode
+
+
+def select_backend(mode):
+    if resolve_mode(mode) == "acrylic":
+        return AcrylicBackend()
+    return OpaqueBackend()
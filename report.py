@@ -0,0 +1,470 @@
+"""Yearly (or any period) HTML reports with inline SVG charts.
+
+The report covers sprints per week, focus streaks, sleep regularity and
+review highlights, in a single self-contained HTML file:
+
+    python report.py 2025
+    python report.py --from 2024-03-01 --to 2025-02-28 -o two-seasons.html
+
+Reports are built from a read-only snapshot of the hot store plus the
+archive. The app renders them in a separate process, so a multi-year report
+never competes with the tray app for the GIL. Each week is summarised once
+and kept in ``reports/weeks.json`` together with a fingerprint of that
+week's raw records, so re-running after another week only summarises the
+weeks that changed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+from datetime import date, timedelta
+from html import escape
+
+from archive import ArchiveStore, archive_dir_for, sleep_timestamp
+from storage import load_store, path_next_to
+
+REPORTS_DIR = "reports"
+WEEK_CACHE_FILE = "weeks.json"
+# Bump when the shape of a week summary changes
+CACHE_VERSION = 1
+SPRINT_MINUTES = 5
+HIGHLIGHT_LINES = 3
+DAY_MINUTES = 24 * 60
+
+
+def report_dir_for(data_path):
+    return path_next_to(data_path, REPORTS_DIR)
+
+
+def week_start_of(d):
+    return d - timedelta(days=d.weekday())
+
+
+def year_period(year):
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def available_years(data, archive):
+    years = set(archive.years())
+    years.update(int(ts[:4]) for ts in data["sprint_blocks"])
+    years.update(int(sleep_timestamp(e)[:4]) for e in data["sleep_log"])
+    years.update(int(r["week_start"][:4]) for r in data["weekly_reviews"])
+    return sorted(years)
+
+
+# Snapshot
+def snapshot(data, archive, start, end):
+    """A picklable, read-only copy of everything between start and end (inclusive).
+
+    ``data`` only needs sprint_blocks, sleep_log and weekly_reviews; pass
+    copies when the lists may change underneath (e.g. from the timer thread).
+    """
+    first, last = start.isoformat(), end.isoformat()
+    # Reviews are keyed by week, and the first week may start before `start`
+    first_week = week_start_of(start).isoformat()
+    sprints, sleep, reviews = [], [], {}
+    for year in range(start.year, end.year + 1):
+        if archive.has_year(year):
+            sprints.extend(archive.sprints(year))
+            sleep.extend(archive.sleep_log(year))
+            reviews.update(archive.reviews(year))
+    sprints.extend(data["sprint_blocks"])
+    sleep.extend(data["sleep_log"])
+    for review in data["weekly_reviews"]:
+        reviews[review["week_start"]] = review
+
+    return {
+        "start": first,
+        "end": last,
+        "sprint_blocks": tuple(sorted(ts for ts in sprints if first <= ts[:10] <= last)),
+        "sleep_log": tuple(sorted(
+            (e for e in sleep if first <= sleep_timestamp(e)[:10] <= last), key=sleep_timestamp)),
+        "weekly_reviews": tuple(
+            dict(reviews[week]) for week in sorted(reviews) if first_week <= week <= last),
+    }
+
+
+# Per-week summaries
+def group_by_week(snap):
+    start = week_start_of(date.fromisoformat(snap["start"]))
+    end = date.fromisoformat(snap["end"])
+    weeks = {}
+    d = start
+    while d <= end:
+        weeks[d.isoformat()] = {"sprints": [], "sleep": [], "review": None}
+        d += timedelta(days=7)
+
+    week_of_day = {}
+
+    def week_key(day):
+        key = week_of_day.get(day)
+        if key is None:
+            key = week_of_day[day] = week_start_of(date.fromisoformat(day)).isoformat()
+        return key
+
+    for ts in snap["sprint_blocks"]:
+        weeks[week_key(ts[:10])]["sprints"].append(ts)
+    for entry in snap["sleep_log"]:
+        weeks[week_key(sleep_timestamp(entry)[:10])]["sleep"].append(entry)
+    for review in snap["weekly_reviews"]:
+        if review["week_start"] in weeks:
+            weeks[review["week_start"]]["review"] = review
+    return weeks
+
+
+def fingerprint(week):
+    h = hashlib.sha1()
+    h.update("\n".join(week["sprints"]).encode("utf-8"))
+    h.update(b"\0")
+    h.update("\n".join(week["sleep"]).encode("utf-8"))
+    h.update(b"\0")
+    h.update(json.dumps(week["review"], sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _first_lines(text, n=HIGHLIGHT_LINES):
+    lines = [line.strip(" -*\t") for line in (text or "").splitlines()]
+    return [line for line in lines if line][:n]
+
+
+def summarise_week(week_start, week):
+    start = date.fromisoformat(week_start)
+    per_day = [0] * 7
+    for ts in week["sprints"]:
+        per_day[(date.fromisoformat(ts[:10]) - start).days] += 1
+
+    bedtimes, wakes = [], []
+    for entry in week["sleep"]:
+        kind, stamp = entry.split(" at ")
+        minutes = _minutes(stamp[11:16])
+        if kind == "Sleep":
+            # Count 00:30 as 24:30 so late nights average with the evening
+            bedtimes.append(minutes + DAY_MINUTES if minutes < DAY_MINUTES // 2 else minutes)
+        else:
+            wakes.append(minutes)
+
+    review = week["review"]
+    highlights = None
+    if review is not None:
+        highlights = {
+            "wins": _first_lines(review.get("wins")),
+            "priorities": _first_lines(review.get("priorities")),
+        }
+    return {"per_day": per_day, "bedtimes": bedtimes, "wakes": wakes, "review": highlights}
+
+
+class WeekCache:
+    """Week summaries keyed by week start, valid while the fingerprint matches."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.weeks = {}
+        self.dirty = False
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored.get("version") == CACHE_VERSION:
+                    self.weeks = stored["weeks"]
+            except (FileNotFoundError, ValueError):
+                pass
+
+    def get(self, week_start, fp):
+        entry = self.weeks.get(week_start)
+        if entry is not None and entry["fp"] == fp:
+            return entry["summary"]
+        return None
+
+    def put(self, week_start, fp, summary):
+        self.weeks[week_start] = {"fp": fp, "summary": summary}
+        self.dirty = True
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "weeks": self.weeks}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def week_summaries(snap, cache):
+    """Return ({week_start: summary}, number of weeks recomputed)."""
+    summaries, computed = {}, 0
+    for week_start, week in group_by_week(snap).items():
+        fp = fingerprint(week)
+        summary = cache.get(week_start, fp)
+        if summary is None:
+            summary = summarise_week(week_start, week)
+            cache.put(week_start, fp, summary)
+            computed += 1
+        summaries[week_start] = summary
+    return summaries, computed
+
+
+# Aggregates
+def daily_counts(summaries, start, end):
+    """[(date, sprints)] for every day of the period."""
+    days = []
+    for week_start, summary in summaries.items():
+        ws = date.fromisoformat(week_start)
+        for i, n in enumerate(summary["per_day"]):
+            d = ws + timedelta(days=i)
+            if start <= d <= end:
+                days.append((d, n))
+    days.sort()
+    return days
+
+
+def streaks(days):
+    """Runs of consecutive days with at least one sprint: [(first, last, length)]."""
+    runs, first, length = [], None, 0
+    for d, n in days:
+        if n:
+            first = first or d
+            length += 1
+        elif first:
+            runs.append((first, d - timedelta(days=1), length))
+            first, length = None, 0
+    if first:
+        runs.append((first, days[-1][0], length))
+    return runs
+
+
+def _clock(minutes):
+    minutes = int(round(minutes)) % DAY_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _stdev(values):
+    return statistics.pstdev(values) if len(values) > 1 else 0.0
+
+
+# SVG charts
+CHART_WIDTH = 760
+CHART_HEIGHT = 180
+CHART_PAD = 28
+
+
+def _month_ticks(weeks):
+    ticks, last_month = [], None
+    for i, week_start in enumerate(weeks):
+        month = week_start[:7]
+        if month != last_month:
+            ticks.append((i, date.fromisoformat(week_start).strftime("%b")))
+            last_month = month
+    return ticks
+
+
+def bar_chart(weeks, values, color="#3b82f6"):
+    n = max(len(values), 1)
+    top = max(values, default=0) or 1
+    plot_w = CHART_WIDTH - 2 * CHART_PAD
+    plot_h = CHART_HEIGHT - 2 * CHART_PAD
+    slot = plot_w / n
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" class="chart">']
+    parts.append(f'<text x="4" y="{CHART_PAD - 8}" class="axis">{top}</text>')
+    for i, (week_start, value) in enumerate(zip(weeks, values)):
+        h = plot_h * value / top
+        x = CHART_PAD + i * slot
+        y = CHART_PAD + plot_h - h
+        parts.append(
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{max(slot - 1, 1):.1f}" height="{h:.1f}" '
+            f'fill="{color}"><title>Week of {week_start}: {value}</title></rect>')
+    for i, label in _month_ticks(weeks):
+        parts.append(f'<text x="{CHART_PAD + i * slot:.1f}" y="{CHART_HEIGHT - 8}" '
+                     f'class="axis">{label}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def line_chart(weeks, series):
+    """series: [(label, color, [minutes or None per week])], plotted as times of day."""
+    values = [v for _, _, points in series for v in points if v is not None]
+    if not values:
+        return '<p class="muted">No sleep logged in this period.</p>'
+    low = min(values) // 60 * 60
+    high = -(-max(values) // 60) * 60
+    span = max(high - low, 60)
+    plot_w = CHART_WIDTH - 2 * CHART_PAD
+    plot_h = CHART_HEIGHT - 2 * CHART_PAD
+    step = plot_w / max(len(weeks) - 1, 1)
+
+    def y(v):
+        return CHART_PAD + plot_h * (1 - (v - low) / span)
+
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" class="chart">']
+    for v in (low, high):
+        parts.append(f'<text x="4" y="{y(v) + 4:.1f}" class="axis">{_clock(v)}</text>')
+    for label, color, points in series:
+        segments, current = [], []
+        for i, v in enumerate(points):
+            if v is None:
+                if current:
+                    segments.append(current)
+                current = []
+            else:
+                current.append(f"{CHART_PAD + i * step:.1f},{y(v):.1f}")
+        if current:
+            segments.append(current)
+        for segment in segments:
+            parts.append(f'<polyline points="{" ".join(segment)}" fill="none" '
+                         f'stroke="{color}" stroke-width="2"><title>{label}</title></polyline>')
+    for i, label in _month_ticks(weeks):
+        parts.append(f'<text x="{CHART_PAD + i * step:.1f}" y="{CHART_HEIGHT - 8}" '
+                     f'class="axis">{label}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+# HTML
+STYLE = """
+body { background: #0f172a; color: #e5e7eb; font-family: "Segoe UI", sans-serif;
+       max-width: 820px; margin: 32px auto; padding: 0 16px; }
+h1 { font-size: 26px; } h2 { font-size: 18px; margin-top: 32px; }
+.cards { display: flex; flex-wrap: wrap; gap: 12px; }
+.card { background: rgba(30,41,59,0.9); border-radius: 10px; padding: 12px 16px; min-width: 140px; }
+.card b { display: block; font-size: 22px; color: #fff; }
+.chart { width: 100%; background: rgba(30,41,59,0.6); border-radius: 10px; }
+.axis { fill: #9ca3af; font-size: 11px; }
+.muted { color: #9ca3af; }
+table { border-collapse: collapse; } td { padding: 4px 12px 4px 0; }
+.week { margin-bottom: 12px; } .week h3 { font-size: 14px; margin: 0 0 4px; color: #93c5fd; }
+ul { margin: 0; padding-left: 20px; }
+"""
+
+
+def render_html(summaries, start, end):
+    weeks = sorted(summaries)
+    days = daily_counts(summaries, start, end)
+    sprint_weeks = [sum(summaries[w]["per_day"]) for w in weeks]
+    total = sum(sprint_weeks)
+    active_days = sum(1 for _, n in days if n)
+    runs = streaks(days)
+    longest = sorted(runs, key=lambda r: (-r[2], r[0]))[:5]
+    current = runs[-1][2] if runs and runs[-1][1] == end else 0
+
+    bedtimes = [m for w in weeks for m in summaries[w]["bedtimes"]]
+    wakes = [m for w in weeks for m in summaries[w]["wakes"]]
+    avg_bed = [statistics.mean(summaries[w]["bedtimes"]) if summaries[w]["bedtimes"] else None
+               for w in weeks]
+    avg_wake = [statistics.mean(summaries[w]["wakes"]) if summaries[w]["wakes"] else None
+                for w in weeks]
+    reviewed = [w for w in weeks if summaries[w]["review"] is not None]
+
+    def card(value, label):
+        return f'<div class="card"><b>{escape(str(value))}</b>{escape(label)}</div>'
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">",
+        f"<title>ADHD Central report {start} – {end}</title>",
+        f"<style>{STYLE}</style></head><body>",
+        "<h1>ADHD Central report</h1>",
+        f'<p class="muted">{start.strftime("%b %d, %Y")} – {end.strftime("%b %d, %Y")}</p>',
+        '<div class="cards">',
+        card(total, "sprints"),
+        card(f"{total * SPRINT_MINUTES // 60}h {total * SPRINT_MINUTES % 60}m", "focused"),
+        card(f"{active_days}/{len(days)}", "active days"),
+        card(f"{longest[0][2] if longest else 0} days", "longest streak"),
+        card(f"{len(reviewed)}/{len(weeks)}", "weeks reviewed"),
+        "</div>",
+        "<h2>Sprints per week</h2>",
+        bar_chart(weeks, sprint_weeks),
+        "<h2>Focus streaks</h2>",
+    ]
+
+    if longest:
+        parts.append(f'<p class="muted">Current streak: {current} days</p><table>')
+        for first, last, length in longest:
+            parts.append(f"<tr><td><b>{length} days</b></td>"
+                         f"<td>{first.strftime('%b %d')} – {last.strftime('%b %d, %Y')}</td></tr>")
+        parts.append("</table>")
+    else:
+        parts.append('<p class="muted">No sprints in this period.</p>')
+
+    parts.append("<h2>Sleep regularity</h2>")
+    if bedtimes or wakes:
+        parts.append('<div class="cards">')
+        if bedtimes:
+            parts.append(card(_clock(statistics.mean(bedtimes)), "average bedtime"))
+            parts.append(card(f"±{round(_stdev(bedtimes))} min", "bedtime spread"))
+        if wakes:
+            parts.append(card(_clock(statistics.mean(wakes)), "average wake time"))
+            parts.append(card(f"±{round(_stdev(wakes))} min", "wake spread"))
+        parts.append("</div>")
+    parts.append(line_chart(weeks, [("Bedtime", "#a78bfa", avg_bed),
+                                    ("Wake time", "#fbbf24", avg_wake)]))
+
+    parts.append("<h2>Review highlights</h2>")
+    if not reviewed:
+        parts.append('<p class="muted">No weekly reviews in this period.</p>')
+    for week_start in reversed(reviewed):
+        review = summaries[week_start]["review"]
+        if not (review["wins"] or review["priorities"]):
+            continue
+        parts.append(f'<div class="week"><h3>Week of '
+                     f'{date.fromisoformat(week_start).strftime("%b %d, %Y")}</h3><ul>')
+        parts.extend(f"<li>{escape(line)}</li>" for line in review["wins"])
+        parts.extend(f'<li class="muted">Priority: {escape(line)}</li>'
+                     for line in review["priorities"])
+        parts.append("</ul></div>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_report(snap, path, cache_path=None):
+    """Build the report for a snapshot and write it to path.
+
+    Module-level so it can run in a worker process. Returns (path, weeks
+    recomputed).
+    """
+    cache = WeekCache(cache_path)
+    summaries, computed = week_summaries(snap, cache)
+    cache.save()
+    html = render_html(summaries, date.fromisoformat(snap["start"]), date.fromisoformat(snap["end"]))
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, path)
+    return path, computed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="report", description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data.json", help="data file (default: data.json)")
+    parser.add_argument("year", nargs="?", type=int, help="calendar year (default: this year)")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument("-o", "--output", help="output file (default: report-<period>.html)")
+    args = parser.parse_args(argv)
+
+    if args.start or args.end:
+        start = args.start or date(1970, 1, 1)
+        end = args.end or date.today()
+    else:
+        start, end = year_period(args.year or date.today().year)
+    end = min(end, date.today())
+    output = args.output or (
+        f"report-{args.year}.html" if args.year else f"report-{start}-{end}.html")
+
+    data = load_store(args.data)
+    archive = ArchiveStore(archive_dir_for(args.data))
+    snap = snapshot(data, archive, start, end)
+    cache_path = os.path.join(report_dir_for(args.data), WEEK_CACHE_FILE)
+    path, computed = write_report(snap, output, cache_path)
+    print(f"Wrote {path} ({computed} weeks recomputed)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""data.json and the change log written between snapshots.
+
+data.json is only ever replaced whole: written to a temporary file, fsynced
+and renamed over the old one, so a crash leaves either the old or the new
+snapshot and never half of one. Saves in between append records to
+``data.json.log`` saying what changed since, so a sprint no longer rewrites
+the whole history:
+
+- ``["extend", name, items]`` new sprints or sleep entries at the end,
+- ``["put", name, item]`` / ``["drop", name, id]`` one task added, changed
+  or removed (tasks and task_archive are keyed by "id"),
+- ``["set", name, items]`` a collection replaced whole.
+
+Each log record is a 4-byte length, a 4-byte CRC-32 and a JSON payload. The
+first record names the CRC of the snapshot the log applies to; a log left
+behind by an older snapshot is ignored. Records are handed to the OS as
+they are written and fsynced at most once per SYNC_INTERVAL (``Store.sync``
+catches the rest), so a crash of the app loses nothing and a power cut
+loses at most the last interval.
+
+Recovery doesn't rewrite the snapshot, which is whole by construction:
+after a crash the records are replayed up to the first one that is
+truncated or fails its checksum, the torn tail is truncated away in place
+and appending carries on from there. Like any other log, it is folded into
+a new snapshot once it passes compact_bytes.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+COLLECTIONS = ("tasks", "task_archive", "sprint_blocks", "sleep_log", "weekly_reviews")
+# Only ever grow at the end or get replaced whole (tiering, clearing)
+APPEND_ONLY = ("sprint_blocks", "sleep_log")
+KEYED = ("tasks", "task_archive")
+SETTINGS_FILE = "settings.json"
+LOG_SUFFIX = ".log"
+RECORD_HEADER = struct.Struct("<II")  # payload length, CRC-32 of the payload
+SYNC_INTERVAL = 1.0
+COMPACT_BYTES = 1 << 20
+
+
+def empty_store():
+    return {name: [] for name in COLLECTIONS}
+
+
+def log_path_for(data_path):
+    return data_path + LOG_SUFFIX
+
+
+def path_next_to(data_path, name):
+    """A file or folder kept in the same directory as the data file."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_path)), name)
+
+
+def _fsync_dir(path):
+    # Makes a rename durable; directories can't be opened on Windows
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_snapshot(path):
+    """(data, crc) of the snapshot; a missing file is an empty store with crc 0."""
+    data = empty_store()
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return data, 0
+    data.update(json.loads(raw.decode("utf-8")))
+    return data, zlib.crc32(raw)
+
+
+def _write_snapshot(path, data):
+    """Atomically replace the snapshot; returns the crc of what was written."""
+    raw = json.dumps(data, indent=4).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+    return zlib.crc32(raw)
+
+
+def encode_record(payload):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def read_log(path, snapshot_crc):
+    """Replayable records of a log and the offset where the verified part ends.
+
+    Stops at the first truncated or corrupt record. Returns (None, 0) if
+    there is no log or it belongs to a different snapshot.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None, 0
+    records, offset = [], 0
+    while offset + RECORD_HEADER.size <= len(raw):
+        length, crc = RECORD_HEADER.unpack_from(raw, offset)
+        start = offset + RECORD_HEADER.size
+        body = raw[start:start + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            break
+        try:
+            records.append(json.loads(body.decode("utf-8")))
+        except ValueError:
+            break
+        offset = start + length
+    if not records or records[0] != ["snapshot", snapshot_crc]:
+        return None, 0
+    return records[1:], offset
+
+
+def apply_records(data, records):
+    positions = {}  # name -> {id: index} for keyed collections, built on demand
+
+    def index(name):
+        if name not in positions:
+            positions[name] = {item["id"]: i for i, item in enumerate(data[name])
+                               if item is not None}
+        return positions[name]
+
+    for op, name, value in records:
+        if op == "extend":
+            data[name].extend(value)
+        elif op == "set":
+            data[name] = value
+            positions.pop(name, None)
+        elif op == "put":
+            i = index(name).get(value["id"])
+            if i is None:
+                index(name)[value["id"]] = len(data[name])
+                data[name].append(value)
+            else:
+                data[name][i] = value
+        elif op == "drop":
+            i = index(name).pop(value, None)
+            if i is not None:
+                data[name][i] = None
+    # Dropped items are left as holes while replaying, so indexes stay valid
+    for name in positions:
+        data[name] = [item for item in data[name] if item is not None]
+
+
+def _reset_log(path, snapshot_crc):
+    with open(path, "wb") as f:
+        f.write(encode_record(["snapshot", snapshot_crc]))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _replay(path):
+    """(data, snapshot crc, records replayed, end of the verified log, log size)."""
+    data, crc = _read_snapshot(path)
+    log_path = log_path_for(path)
+    records, end = read_log(log_path, crc)
+    size = os.path.getsize(log_path) if records is not None else 0
+    if records:
+        apply_records(data, records)
+    return data, crc, records, end, size
+
+
+def load_store(path):
+    """Read the data file and any logged changes, filling in missing collections."""
+    return _replay(path)[0]
+
+
+def save_store(path, data):
+    """Write a complete snapshot; earlier logged changes are folded into it."""
+    crc = _write_snapshot(path, data)
+    _reset_log(log_path_for(path), crc)
+
+
+class Store:
+    """The app's view of data.json: a snapshot plus an open change log.
+
+    ``save`` logs only what changed since the last save without rebuilding
+    or comparing whole collections: APPEND_ONLY collections are tracked by
+    length (plus their first and last saved item, to notice a replacement),
+    keyed collections by the per-item changes the caller hands in, and
+    anything else (the weekly reviews) by comparison with what was last
+    written. Once the log passes compact_bytes it is folded into a fresh
+    snapshot by replaying it from disk. Safe to call from the timer thread
+    and the GUI thread.
+    """
+
+    def __init__(self, path, sync_interval=SYNC_INTERVAL, compact_bytes=COMPACT_BYTES):
+        self.path = path
+        self.log_path = log_path_for(path)
+        self.sync_interval = sync_interval
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._log = None
+        self._seen = {}  # append-only name -> (length, first item, last item)
+        self._last = {}  # other compared collections -> list last written
+        self._dirty = False
+        self._synced_at = 0.0
+        self.recovered = 0  # records replayed at the last load
+        self.dropped_bytes = 0  # torn tail cut off at the last load
+
+    def load(self):
+        """Read snapshot and log, recovering from a crash if needed."""
+        with self._lock:
+            self._close_log()
+            data, crc, records, end, size = _replay(self.path)
+            self.recovered = len(records or ())
+            self.dropped_bytes = size - end
+            self._track(data)
+            if records is None:
+                # No log, or one left by an older snapshot (a crash between
+                # replacing data.json and resetting the log): start a new one
+                if os.path.exists(self.path):
+                    _reset_log(self.log_path, crc)
+                else:
+                    self._write(data)
+            elif self.dropped_bytes:
+                # Cut off the torn tail and keep appending after the good part
+                with open(self.log_path, "rb+") as f:
+                    f.truncate(end)
+                    f.flush()
+                    os.fsync(f.fileno())
+            if end >= self.compact_bytes:
+                self._write(data)
+            self._open_log()
+        return data
+
+    def save(self, data, changes=None):
+        """Log the difference to the last save.
+
+        ``data`` maps collection names to their current contents; names left
+        out are unchanged. A keyed collection given in ``data`` is written
+        whole; otherwise ``changes`` maps it to {id: item dict, or None if
+        the item was removed} for the items touched since the last save.
+        """
+        with self._lock:
+            records = []
+            for name, items in data.items():
+                if name in APPEND_ONLY:
+                    records.extend(self._append_records(name, items))
+                elif name in KEYED:
+                    records.append(["set", name, list(items)])
+                elif items != self._last.get(name):
+                    items = [dict(item) for item in items]
+                    records.append(["set", name, items])
+                    self._last[name] = items
+            for name, items in (changes or {}).items():
+                for key, item in items.items():
+                    records.append(["drop", name, key] if item is None else ["put", name, item])
+            if not records:
+                return
+            if self._log is None:
+                self._open_log()
+            self._log.write(b"".join(encode_record(r) for r in records))
+            self._log.flush()
+            self._dirty = True
+            if self._log.tell() >= self.compact_bytes:
+                self._compact()
+            elif time.monotonic() - self._synced_at >= self.sync_interval:
+                self._sync()
+
+    def _append_records(self, name, items):
+        length, first, last = self._seen.get(name, (0, None, None))
+        n = len(items)
+        if n == length and (n == 0 or (items[0] == first and items[n - 1] == last)):
+            return []
+        if n > length and (length == 0 or (items[0] == first and items[length - 1] == last)):
+            new = items[length:]
+            self._seen[name] = (n, items[0], items[n - 1])
+            return [["extend", name, list(new)]]
+        items = list(items)
+        self._seen[name] = (n, items[0], items[-1]) if items else (0, None, None)
+        return [["set", name, items]]
+
+    def _track(self, data):
+        self._seen = {}
+        for name in APPEND_ONLY:
+            items = data[name]
+            self._seen[name] = (len(items), items[0], items[-1]) if items else (0, None, None)
+        self._last = {name: [dict(item) for item in data[name]]
+                      for name in COLLECTIONS if name not in APPEND_ONLY and name not in KEYED}
+
+    def sync(self):
+        """fsync records written since the last sync; cheap when there are none."""
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """Fold the log into the snapshot so the next start reads one file."""
+        with self._lock:
+            if self._log is None:
+                return
+            logged = self._log.tell() > len(encode_record(["snapshot", 0]))
+            self._close_log()
+            if logged:
+                self._write(_replay(self.path)[0])
+
+    def _compact(self):
+        self._close_log()
+        self._write(_replay(self.path)[0])
+        self._open_log()
+
+    def _sync(self):
+        if self._dirty and self._log is not None:
+            os.fsync(self._log.fileno())
+            self._dirty = False
+        self._synced_at = time.monotonic()
+
+    def _write(self, data):
+        crc = _write_snapshot(self.path, data)
+        _reset_log(self.log_path, crc)
+
+    def _open_log(self):
+        self._log = open(self.log_path, "ab")
+        self._dirty = False
+        self._synced_at = time.monotonic()
+
+    def _close_log(self):
+        if self._log is not None:
+            self._sync()
+            self._log.close()
+            self._log = None
+
+
+def settings_path_for(data_path):
+    """Device-local preferences live next to the data file but are never synced."""
+    return path_next_to(data_path, SETTINGS_FILE)
+
+
+def load_settings(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_settings(path, settings):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=4)
@@ -0,0 +1,372 @@
+"""Multi-device sync through a shared folder (Syncthing, Dropbox, a USB stick...).
+
+Each device appends its own changes to ``<shared>/<device_id>.ndjson`` and
+never touches the other devices' files, so file-sync tools never see
+conflicting writes. A sync round:
+
+1. diffs local data against what the log already knows and appends only
+   the new changes as ops,
+2. reads each other device's log from the byte offset it stopped at last
+   time and merges the new ops.
+
+Merging is deterministic, so every device converges on the same state:
+sprints and sleep events are add-only sets, weekly reviews and task fields
+are last-writer-wins registers ordered by (time of the edit, device id),
+and task completion and sprint counts only ever move forward.
+
+Local bookkeeping (device id, cursors, what has been seen) lives in
+``sync_state.json`` next to the data file. Sprints and sleep events of
+archived years are looked up in the archive instead, so the state only
+grows with the hot store. Two data directories sharing one folder are
+enough to try it out:
+
+    python sync.py --data a/data.json shared/
+    python sync.py --data b/data.json shared/
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import uuid
+
+from archive import ArchiveStore, archive_dir_for, sleep_year, sprint_year
+from clock import SYSTEM_CLOCK
+from storage import load_store, path_next_to, save_store
+from task_store import TaskStore
+
+STATE_FILE = "sync_state.json"
+
+
+def state_path_for(data_path):
+    return path_next_to(data_path, STATE_FILE)
+
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _task_value(task):
+    value = task.to_dict()
+    del value["id"]  # local ids differ between devices; "created" is the key
+    return value
+
+
+class SyncEngine:
+    def __init__(self, state_path, clock=None, archive=None):
+        self.state_path = state_path
+        self.clock = clock or SYSTEM_CLOCK
+        self.archive = archive
+        self._archived = {}  # (kind, year, segments) -> set of archived records
+        # Tasks changed since the last push, once watch() follows a store
+        self._lock = threading.Lock()
+        self._watched = None
+        self._changed_tasks = {}
+        self._check_all = True
+        self.device_id = None
+        self.load_state()
+
+    def load_state(self):
+        """(Re)read the state file, e.g. to forget a round that failed halfway."""
+        state = {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            pass
+        self.device_id = state.get("device_id") or self.device_id or uuid.uuid4().hex[:12]
+        self.sync_dir = state.get("sync_dir")
+        self.seq = state.get("seq", 0)
+        self.cursors = state.get("cursors", {})
+        self.seen_sprints = set(state.get("seen_sprints", ()))
+        self.seen_sleep = set(state.get("seen_sleep", ()))
+        # key -> [digest, timestamp, device] for last-writer-wins registers
+        self.seen_reviews = state.get("seen_reviews", {})
+        self.seen_tasks = state.get("seen_tasks", {})
+        # Set when something needs saving by save_state
+        self.changed = False
+        with self._lock:
+            self._check_all = True
+
+    def watch(self, tasks):
+        """Follow a TaskStore's changes, so a push only digests the tasks that
+        changed instead of every task and the whole archive each round."""
+        self._watched = tasks
+        tasks.subscribe(self._on_task_change)
+
+    def _on_task_change(self, event, task):
+        # Called on the GUI thread and the timer thread
+        with self._lock:
+            if event == "reset":
+                self._check_all = True
+                self._changed_tasks.clear()
+            elif event == "discard":
+                self._changed_tasks.pop(task.id, None)
+            else:
+                self._changed_tasks[task.id] = task
+
+    def _tasks_to_check(self, tasks):
+        with self._lock:
+            if tasks is self._watched:
+                if not self._check_all:
+                    changed, self._changed_tasks = self._changed_tasks, {}
+                    return list(changed.values())
+                # First round since watch() or a reload: check everything once
+                self._check_all = False
+                self._changed_tasks.clear()
+        return list(tasks) + tasks.archive
+
+    def _in_archive(self, kind, year, value):
+        if self.archive is None or not self.archive.has_year(year):
+            return False
+        # Tiering can add segments while the app runs
+        key = (kind, year, len(self.archive.segments))
+        known = self._archived.get(key)
+        if known is None:
+            source = self.archive.sprints if kind == "sprint" else self.archive.sleep_log
+            known = self._archived[key] = set(source(year))
+        return value in known
+
+    def _prune_archived(self):
+        # Records in the archive are answered by it; don't carry them here. A
+        # late arrival for an archived year stays until it is tiered out too,
+        # or every round would push it again.
+        years = set(self.archive.years()) if self.archive is not None else set()
+        if years:
+            self.seen_sprints = {
+                ts for ts in self.seen_sprints
+                if sprint_year(ts) not in years or not self._in_archive("sprint", sprint_year(ts), ts)}
+            self.seen_sleep = {
+                e for e in self.seen_sleep
+                if sleep_year(e) not in years or not self._in_archive("sleep", sleep_year(e), e)}
+
+    def save_state(self):
+        self._prune_archived()
+        state = {
+            "device_id": self.device_id,
+            "sync_dir": self.sync_dir,
+            "seq": self.seq,
+            "cursors": self.cursors,
+            "seen_sprints": sorted(self.seen_sprints),
+            "seen_sleep": sorted(self.seen_sleep),
+            "seen_reviews": self.seen_reviews,
+            "seen_tasks": self.seen_tasks,
+        }
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+        self.changed = False
+
+    # Outgoing
+    def _local_ops(self, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        now = self.clock.now().isoformat()
+
+        for ts in sprint_blocks:
+            if ts not in self.seen_sprints:
+                self.seen_sprints.add(ts)
+                yield {"kind": "sprint", "value": ts}
+
+        for entry in sleep_log:
+            if entry not in self.seen_sleep:
+                self.seen_sleep.add(entry)
+                yield {"kind": "sleep", "value": entry}
+
+        for review in weekly_reviews:
+            review = dict(review)
+            key = review["week_start"]
+            digest = _digest(review)
+            seen = self.seen_reviews.get(key)
+            if seen is None or seen[0] != digest:
+                ts = review.get("updated") or now
+                self.seen_reviews[key] = [digest, ts, self.device_id]
+                yield {"kind": "review", "key": key, "ts": ts, "value": review}
+
+        for task in self._tasks_to_check(tasks):
+            value = _task_value(task)
+            digest = _digest(value)
+            seen = self.seen_tasks.get(task.created)
+            if seen is None or seen[0] != digest:
+                ts = task.updated or now
+                self.seen_tasks[task.created] = [digest, ts, self.device_id]
+                yield {"kind": "task", "key": task.created, "ts": ts, "value": value}
+
+    def outgoing(self, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        """Local changes since the last round as numbered ops, marked as seen."""
+        ops = []
+        for op in self._local_ops(tasks, sprint_blocks, sleep_log, weekly_reviews):
+            self.seq += 1
+            op["seq"] = self.seq
+            op["device"] = self.device_id
+            ops.append(op)
+        return ops
+
+    def write(self, ops):
+        """Append ops to this device's log; only file I/O, so it can run off
+        the GUI thread."""
+        if not ops:
+            return 0
+        os.makedirs(self.sync_dir, exist_ok=True)
+        path = os.path.join(self.sync_dir, f"{self.device_id}.ndjson")
+        with open(path, "a", encoding="utf-8") as f:
+            for op in ops:
+                f.write(json.dumps(op, ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.changed = True
+        return len(ops)
+
+    def push(self, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        """Append local changes since the last sync to this device's log."""
+        return self.write(self.outgoing(tasks, sprint_blocks, sleep_log, weekly_reviews))
+
+    # Incoming
+    def _remote_ops(self):
+        for name in sorted(os.listdir(self.sync_dir)):
+            device, ext = os.path.splitext(name)
+            if ext != ".ndjson" or device == self.device_id:
+                continue
+            path = os.path.join(self.sync_dir, name)
+            offset = self.cursors.get(device, 0)
+            if os.path.getsize(path) <= offset:
+                continue
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    # A trailing partial line is still being written; retry next round
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    yield json.loads(line)
+            self.cursors[device] = offset
+            self.changed = True
+
+    def _wins(self, seen, ts, device):
+        return seen is None or (ts, device) > (seen[1], seen[2])
+
+    def incoming(self):
+        """New ops from the other devices' logs, advancing the cursors; only
+        file I/O, so it can run off the GUI thread."""
+        if not os.path.isdir(self.sync_dir):
+            return []
+        return list(self._remote_ops())
+
+    def pull(self, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        """Merge new ops from other devices into the given collections."""
+        return self.merge(self._remote_ops(), tasks, sprint_blocks, sleep_log, weekly_reviews)
+
+    def merge(self, ops, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        """Apply ops from other devices to the given collections."""
+        sprints = set(sprint_blocks)
+        sleep = set(sleep_log)
+        reviews = {r["week_start"]: i for i, r in enumerate(weekly_reviews)}
+        by_created = {t.created: t for t in tasks}
+        by_created.update((t.created, t) for t in tasks.archive)
+        applied = 0
+
+        for op in ops:
+            kind, value = op["kind"], op["value"]
+            # Anything already seen is in the local data, possibly archived
+            if kind == "sprint":
+                if (value not in self.seen_sprints and value not in sprints
+                        and not self._in_archive(kind, sprint_year(value), value)):
+                    sprints.add(value)
+                    sprint_blocks.append(value)
+                    applied += 1
+                self.seen_sprints.add(value)
+            elif kind == "sleep":
+                if (value not in self.seen_sleep and value not in sleep
+                        and not self._in_archive(kind, sleep_year(value), value)):
+                    sleep.add(value)
+                    sleep_log.append(value)
+                    applied += 1
+                self.seen_sleep.add(value)
+            elif kind == "review":
+                key = op["key"]
+                if self._wins(self.seen_reviews.get(key), op["ts"], op["device"]):
+                    self.seen_reviews[key] = [_digest(value), op["ts"], op["device"]]
+                    if key in reviews:
+                        weekly_reviews[reviews[key]] = value
+                    else:
+                        reviews[key] = len(weekly_reviews)
+                        weekly_reviews.append(value)
+                    applied += 1
+            elif kind == "task":
+                key = op["key"]
+                local = by_created.get(key)
+                seen = self.seen_tasks.get(key)
+                if local is None:
+                    local = tasks.import_task(value)
+                    by_created[key] = local
+                else:
+                    self._merge_task(tasks, local, value, self._wins(seen, op["ts"], op["device"]))
+                ts, device = op["ts"], op["device"]
+                if seen is not None and not self._wins(seen, ts, device):
+                    ts, device = seen[1], seen[2]
+                self.seen_tasks[key] = [_digest(_task_value(local)), ts, device]
+                applied += 1
+        return applied
+
+    def _merge_task(self, tasks, local, value, remote_wins):
+        # Keep the winner's edit time rather than stamping the merge
+        fields = {"updated": local.updated}
+        if remote_wins:
+            for name in ("title", "tags", "priority", "due", "updated"):
+                fields[name] = value.get(name)
+        fields["sprint_count"] = max(local.sprint_count, value.get("sprint_count", 0))
+        fields["last_sprint"] = max(filter(None, (local.last_sprint, value.get("last_sprint"))),
+                                    default=None)
+
+        if tasks.get(local.id) is local:
+            tasks.update(local.id, **fields)
+            if value.get("completed"):
+                tasks.complete(local.id)
+                local.completed = value["completed"]
+        else:
+            # Already archived: completion is final, keep the earliest time
+            for name, v in fields.items():
+                setattr(local, name, tuple(v) if name == "tags" else v)
+            if value.get("completed"):
+                local.completed = min(local.completed, value["completed"])
+            tasks.touch(local)
+
+    def sync(self, tasks, sprint_blocks, sleep_log, weekly_reviews):
+        """Run one push/pull round; returns (ops pushed, ops applied)."""
+        os.makedirs(self.sync_dir, exist_ok=True)
+        pushed = self.push(tasks, sprint_blocks, sleep_log, weekly_reviews)
+        applied = self.pull(tasks, sprint_blocks, sleep_log, weekly_reviews)
+        return pushed, applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sync", description="Sync data through a shared folder.")
+    parser.add_argument("--data", default="data.json", help="data file (default: data.json)")
+    parser.add_argument("sync_dir", nargs="?", help="shared folder (remembered after first use)")
+    args = parser.parse_args(argv)
+
+    engine = SyncEngine(state_path_for(args.data),
+                        archive=ArchiveStore(archive_dir_for(args.data)))
+    if args.sync_dir:
+        engine.sync_dir = os.path.abspath(args.sync_dir)
+    if not engine.sync_dir:
+        parser.error("no shared folder configured yet")
+
+    data = load_store(args.data)
+    tasks = TaskStore()
+    tasks.load(data["tasks"], data["task_archive"])
+    pushed, applied = engine.sync(tasks, data["sprint_blocks"], data["sleep_log"], data["weekly_reviews"])
+    data["tasks"] = tasks.to_list()
+    data["task_archive"] = tasks.archive_to_list()
+    save_store(args.data, data)
+    # State goes last: if we crash before this, the next round re-reads the
+    # same ops and the merge is idempotent.
+    engine.save_state()
+    print(f"Device {engine.device_id}: pushed {pushed} changes, applied {applied}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+import bisect
+from collections import defaultdict
+from contextlib import suppress
+from datetime import timedelta
+
+from clock import SYSTEM_CLOCK
+
+PRIORITIES = ("low", "normal", "high", "urgent")
+DEFAULT_PRIORITY = "normal"
+
+
+class Task:
+    """A single task record. Dates are stored as ISO strings, like sprint_blocks.
+
+    ``updated`` is when title, tags, priority or due last changed; sync uses
+    it to order concurrent edits. Tasks don't read the time themselves:
+    TaskStore stamps ``created`` from its clock.
+    """
+
+    __slots__ = ("id", "title", "tags", "priority", "due", "created", "completed",
+                 "sprint_count", "last_sprint", "updated")
+
+    def __init__(self, id, title, tags=(), priority=DEFAULT_PRIORITY, due=None,
+                 created=None, completed=None, sprint_count=0, last_sprint=None, updated=None):
+        self.id = id
+        self.title = title
+        self.tags = tuple(sorted({t.strip().lower() for t in tags if t.strip()}))
+        self.priority = priority if priority in PRIORITIES else DEFAULT_PRIORITY
+        self.due = due
+        self.created = created
+        self.completed = completed
+        self.sprint_count = sprint_count
+        self.last_sprint = last_sprint
+        self.updated = updated or self.created
+
+    @property
+    def priority_rank(self):
+        return PRIORITIES.index(self.priority)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "tags": list(self.tags),
+            "priority": self.priority,
+            "due": self.due,
+            "created": self.created,
+            "completed": self.completed,
+            "sprint_count": self.sprint_count,
+            "last_sprint": self.last_sprint,
+            "updated": self.updated,
+        }
+
+    @classmethod
+    def from_dict(cls, data, now=None):
+        """Build a task from its dict; ``now`` (ISO) stands in for a missing created."""
+        return cls(
+            data["id"],
+            data["title"],
+            tags=data.get("tags", ()),
+            priority=data.get("priority", DEFAULT_PRIORITY),
+            due=data.get("due"),
+            created=data.get("created") or now,
+            completed=data.get("completed"),
+            sprint_count=data.get("sprint_count", 0),
+            last_sprint=data.get("last_sprint"),
+            updated=data.get("updated"),
+        )
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.title!r})"
+
+
+class TaskStore:
+    """Active tasks plus secondary indexes kept in sync on every mutation.
+
+    Filtered views read from the indexes instead of scanning the backlog:
+    tags and priorities map to id sets, due dates live in a sorted list of
+    (due, id) pairs so date ranges are a bisect away. Completed tasks move
+    to ``archive`` rather than being deleted.
+
+    Listeners registered with ``subscribe`` are called as
+    ``listener(event, task)`` after each change, where event is one of
+    "add", "update", "remove", "archive" (a completed task imported straight
+    into the archive), "discard" (an add or import undone, see ``_notify``)
+    or "reset" (task is None for "reset").
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or SYSTEM_CLOCK
+        self._listeners = []
+        self._reset()
+
+    def _reset(self):
+        self._tasks = {}
+        self.archive = []
+        self._next_id = 1
+        self._by_tag = defaultdict(set)
+        self._by_priority = {p: set() for p in PRIORITIES}
+        self._due = []
+
+    # Container protocol: iterating yields active tasks in creation order
+    def __iter__(self):
+        return iter(self._tasks.values())
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __bool__(self):
+        return bool(self._tasks)
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def first(self):
+        return next(iter(self._tasks.values()), None)
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, task=None, undo=None):
+        """Tell the listeners about a change.
+
+        If one raises, ``undo`` reverts the change in the store and returns
+        the event describing the revert, which is sent to the listeners that
+        had already seen the change; then the error propagates. A bad record
+        therefore can't stay half-applied, indexed here but not saved.
+        """
+        for i, listener in enumerate(self._listeners):
+            try:
+                listener(event, task)
+            except Exception:
+                if undo is not None:
+                    revert = undo()
+                    for seen in self._listeners[:i + 1]:
+                        # Best effort: the original error is the one to report
+                        with suppress(Exception):
+                            seen(revert, task)
+                raise
+
+    # Index maintenance
+    def _index(self, task):
+        for tag in task.tags:
+            self._by_tag[tag].add(task.id)
+        self._by_priority[task.priority].add(task.id)
+        if task.due:
+            bisect.insort(self._due, (task.due, task.id))
+
+    def _unindex(self, task):
+        for tag in task.tags:
+            ids = self._by_tag[tag]
+            ids.discard(task.id)
+            if not ids:
+                del self._by_tag[tag]
+        self._by_priority[task.priority].discard(task.id)
+        if task.due:
+            i = bisect.bisect_left(self._due, (task.due, task.id))
+            if i < len(self._due) and self._due[i] == (task.due, task.id):
+                del self._due[i]
+
+    # Mutations
+    def add(self, title, tags=(), priority=DEFAULT_PRIORITY, due=None):
+        task = Task(self._next_id, title, tags, priority, due,
+                    created=self.clock.now().isoformat())
+        self._insert(task)
+        self._notify("add", task, undo=lambda: self._discard(task))
+        return task
+
+    def _insert(self, task):
+        self._tasks[task.id] = task
+        self._next_id = max(self._next_id, task.id + 1)
+        self._index(task)
+
+    def _discard(self, task):
+        if self._tasks.get(task.id) is task:
+            del self._tasks[task.id]
+            self._unindex(task)
+        elif self.archive and self.archive[-1] is task:
+            self.archive.pop()
+        return "discard"
+
+    def _restore(self, task, fields):
+        def undo():
+            indexed = self._tasks.get(task.id) is task
+            if indexed:
+                self._unindex(task)
+            for name, value in fields.items():
+                setattr(task, name, value)
+            if indexed:
+                self._index(task)
+            return "update"
+        return undo
+
+    def import_task(self, data):
+        """Insert a task record from another store under a fresh id."""
+        task = Task.from_dict({**data, "id": self._next_id}, now=self.clock.now().isoformat())
+        self._next_id += 1
+        if task.completed:
+            self.archive.append(task)
+            self._notify("archive", task, undo=lambda: self._discard(task))
+        else:
+            self._insert(task)
+            self._notify("add", task, undo=lambda: self._discard(task))
+        return task
+
+    def update(self, task_id, **fields):
+        """Change fields of an active task; stamps ``updated`` unless it is given."""
+        task = self._tasks[task_id]
+        before = {name: getattr(task, name) for name in Task.__slots__}
+        self._unindex(task)
+        updated = Task.from_dict({**task.to_dict(), "updated": self.clock.now().isoformat(),
+                                  **fields})
+        for name in Task.__slots__:
+            setattr(task, name, getattr(updated, name))
+        self._index(task)
+        self._notify("update", task, undo=self._restore(task, before))
+        return task
+
+    def touch(self, task):
+        """Report a change made directly to a task's fields, e.g. an archived one."""
+        self._notify("update", task)
+
+    def record_sprint(self, task_id):
+        task = self._tasks.get(task_id)
+        if task is not None:
+            before = {"sprint_count": task.sprint_count, "last_sprint": task.last_sprint}
+            task.sprint_count += 1
+            task.last_sprint = self.clock.now().isoformat()
+            self._notify("update", task, undo=self._restore(task, before))
+        return task
+
+    def complete(self, task_id):
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+        self._unindex(task)
+        task.completed = self.clock.now().isoformat()
+        self.archive.append(task)
+        self._notify("remove", task, undo=lambda: self._reopen(task))
+        return task
+
+    def _reopen(self, task):
+        self.archive.pop()
+        task.completed = None
+        self._tasks[task.id] = task
+        self._index(task)
+        return "add"
+
+    # Filtered views
+    def tags(self):
+        return sorted(self._by_tag)
+
+    def _ordered(self, ids):
+        # Ids are assigned monotonically, so sorting ids restores creation order
+        return [self._tasks[i] for i in sorted(ids)]
+
+    def with_tag(self, tag):
+        return self._ordered(self._by_tag.get(tag.lower(), ()))
+
+    def with_priority(self, priority):
+        return self._ordered(self._by_priority.get(priority, ()))
+
+    def at_least_priority(self, priority):
+        ids = set()
+        for p in PRIORITIES[PRIORITIES.index(priority):]:
+            ids |= self._by_priority[p]
+        return self._ordered(ids)
+
+    def due_between(self, start=None, end=None):
+        """Tasks with start <= due < end, ordered by due date."""
+        lo = 0 if start is None else bisect.bisect_left(self._due, (start.isoformat(),))
+        hi = len(self._due) if end is None else bisect.bisect_left(self._due, (end.isoformat(),))
+        return [self._tasks[task_id] for _, task_id in self._due[lo:hi]]
+
+    def query(self, text, today=None):
+        """Filter by a space separated query such as ``tag:work due:week``.
+
+        Supported terms: ``tag:<name>``, ``priority:<level>`` (that level or
+        higher), ``due:today``, ``due:week``, ``due:overdue`` and plain words
+        matched against the title.
+        """
+        today = today or self.clock.today()
+        result = None
+        words = []
+
+        for term in text.split():
+            key, sep, value = term.partition(":")
+            key = key.lower()
+            value = value.lower()
+            if sep and key == "tag":
+                matched = self.with_tag(value)
+            elif sep and key == "priority" and value in PRIORITIES:
+                matched = self.at_least_priority(value)
+            elif sep and key == "due" and value == "today":
+                matched = self.due_between(today, today + timedelta(days=1))
+            elif sep and key == "due" and value == "week":
+                week_start = today - timedelta(days=today.weekday())
+                matched = self.due_between(week_start, week_start + timedelta(days=7))
+            elif sep and key == "due" and value == "overdue":
+                matched = self.due_between(None, today)
+            else:
+                words.append(term.lower())
+                continue
+
+            if result is None:
+                result = matched
+            else:
+                ids = {t.id for t in matched}
+                result = [t for t in result if t.id in ids]
+
+        if result is None:
+            result = list(self)
+        if words:
+            result = [t for t in result if all(w in t.title.lower() for w in words)]
+        return result
+
+    # Persistence
+    def load(self, tasks, archive=()):
+        self._reset()
+        now = self.clock.now().isoformat()
+        for i, item in enumerate(tasks, start=1):
+            # Older data files stored tasks as bare strings
+            if isinstance(item, str):
+                item = {"id": i, "title": item}
+            self._insert(Task.from_dict(item, now=now))
+        self.archive = [Task.from_dict(item, now=now) for item in archive]
+        for task in self.archive:
+            self._next_id = max(self._next_id, task.id + 1)
+        self._notify("reset")
+
+    def to_list(self):
+        return [t.to_dict() for t in self]
+
+    def archive_to_list(self):
+        return [t.to_dict() for t in self.archive]
@@ -0,0 +1,72 @@
+"""Completed years move into read-only segments; late arrivals get their own."""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive import ArchiveStore  # noqa: E402
+
+
+def hot_data():
+    sprints = ["2024-06-03T09:00:00", "2024-12-30T10:00:00", "2025-01-02T09:00:00"]
+    sleep = ["Sleep at 2024-12-31 23:30", "Wake at 2025-01-01 08:00"]
+    reviews = [{"week_start": "2024-12-23", "wins": "rested"},
+               {"week_start": "2024-12-30", "wins": "new year"}]
+    return sprints, sleep, reviews
+
+
+def test_tier_out_moves_completed_years(tmp_path):
+    archive = ArchiveStore(str(tmp_path / "archive"))
+    sprints, sleep, reviews = hot_data()
+
+    # Still inside the grace period: nothing moves
+    assert archive.tier_out(sprints, sleep, reviews, today=date(2025, 1, 10)) == 0
+    assert archive.segments == []
+
+    assert archive.tier_out(sprints, sleep, reviews, today=date(2025, 1, 20)) == 5
+    assert sprints == ["2025-01-02T09:00:00"]
+    assert sleep == ["Wake at 2025-01-01 08:00"]
+    assert [r["week_start"] for r in reviews] == []
+    assert archive.years() == [2024]
+    assert archive.sprints(2024) == ["2024-06-03T09:00:00", "2024-12-30T10:00:00"]
+    assert archive.sleep_log(2024) == ["Sleep at 2024-12-31 23:30"]
+    assert archive.get_review("2024-12-30")["wins"] == "new year"
+
+    summary = archive.summaries(2024)[0]
+    assert summary["sprints_per_week"] == {"2024-06-03": 1, "2024-12-30": 1}
+    assert summary["review_weeks"] == ["2024-12-23", "2024-12-30"]
+
+    # The index is what a new process reads back
+    reopened = ArchiveStore(archive.directory)
+    assert reopened.counts() == {"sprint": 2, "sleep": 1, "review": 2}
+    assert reopened.sprints(2024) == archive.sprints(2024)
+
+
+def test_late_arrival_goes_into_an_extra_segment(tmp_path):
+    archive = ArchiveStore(str(tmp_path / "archive"))
+    sprints, sleep, reviews = hot_data()
+    archive.tier_out(sprints, sleep, reviews, today=date(2025, 2, 1))
+    first = os.path.join(archive.directory, "2024.json.gz")
+    mtime = os.stat(first).st_mtime_ns
+
+    # Sync brings back one known sprint, one new sprint and an edited review
+    sprints += ["2024-12-30T10:00:00", "2024-11-04T09:00:00"]
+    reviews.append({"week_start": "2024-12-30", "wins": "new year, edited"})
+    reviews.append({"week_start": "2024-12-23", "wins": "rested"})
+    assert archive.tier_out(sprints, sleep, reviews, today=date(2025, 2, 1)) == 4
+
+    assert [s["file"] for s in archive.segments] == ["2024.json.gz", "2024-1.json.gz"]
+    assert os.stat(first).st_mtime_ns == mtime
+    assert sorted(archive.sprints(2024)) == [
+        "2024-06-03T09:00:00", "2024-11-04T09:00:00", "2024-12-30T10:00:00",
+    ]
+    assert archive.get_review("2024-12-30")["wins"] == "new year, edited"
+    assert archive.get_review("2024-12-23")["wins"] == "rested"
+    assert archive.summaries(2024)[1]["total_sprints"] == 1
+    assert sprints == ["2025-01-02T09:00:00"]
+
+    # Nothing new: no further segment
+    sprints.append("2024-06-03T09:00:00")
+    archive.tier_out(sprints, sleep, reviews, today=date(2025, 2, 1))
+    assert len(archive.segments) == 2
@@ -0,0 +1,46 @@
+"""LRUCache evicts the least recently used entry and reports every eviction."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import LRUCache  # noqa: E402
+
+
+def make_cache(maxsize):
+    evicted = []
+    return LRUCache(maxsize, on_evict=lambda key, value: evicted.append((key, value))), evicted
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, evicted = make_cache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert evicted == [("b", 2)]
+    assert "b" not in cache and cache.get("b") is None
+    assert cache.get("b", "gone") == "gone"
+    assert len(cache) == 2
+
+    # Replacing a value refreshes the entry instead of evicting
+    cache.put("a", 10)
+    cache.put("d", 4)
+    assert evicted == [("b", 2), ("c", 3)]
+    assert cache.get("a") == 10
+
+
+def test_invalidate_and_clear_release_entries():
+    cache, evicted = make_cache(3)
+    for key in "abc":
+        cache.put(key, key.upper())
+
+    cache.invalidate("b")
+    cache.invalidate("missing")
+    assert evicted == [("b", "B")]
+    assert "b" not in cache
+
+    cache.clear()
+    assert evicted == [("b", "B"), ("a", "A"), ("c", "C")]
+    assert len(cache) == 0
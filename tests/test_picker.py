@@ -0,0 +1,98 @@
+"""TaskPicker's Fenwick tree always holds the weights of the active tasks."""
+import os
+import random
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from clock import SimulatedClock  # noqa: E402
+from picker import FenwickTree, TaskPicker  # noqa: E402
+from task_store import PRIORITIES, TaskStore  # noqa: E402
+
+
+def make_picker(seed=0):
+    store = TaskStore(clock=SimulatedClock(datetime(2026, 3, 2, 9, 0)))
+    return store, TaskPicker(store, rng=random.Random(seed))
+
+
+def check_weights(store, picker):
+    """Every active task's slot holds its current weight; free slots hold 0."""
+    tree = picker._tree
+    expected = {t.id: picker.weight(t, picker._today) for t in store}
+    assert set(picker._slots) == set(expected)
+    for slot, task_id in enumerate(picker._task_ids):
+        want = expected[task_id] if task_id is not None else 0.0
+        got = tree_prefix(tree, slot + 1) - tree_prefix(tree, slot)
+        assert got == pytest.approx(want)
+    assert tree.total() == pytest.approx(sum(expected.values()))
+
+
+def tree_prefix(tree, n):
+    result = 0.0
+    while n > 0:
+        result += tree.tree[n]
+        n -= n & -n
+    return result
+
+
+def test_fenwick_find_matches_prefix_sums():
+    weights = [1.0, 0.0, 2.5, 4.0, 0.5]
+    tree = FenwickTree.build(weights)
+    assert tree.total() == pytest.approx(8.0)
+    assert [tree.find(x) for x in (0.0, 0.99, 1.0, 3.4, 3.5, 7.6)] == [0, 0, 2, 2, 3, 4]
+
+    tree.add(1, 3.0)
+    assert tree.total() == pytest.approx(11.0)
+    assert tree.find(1.5) == 1
+
+
+def test_weights_follow_add_update_and_complete():
+    store, picker = make_picker()
+    rng = random.Random(1)
+    ids = []
+    for i in range(40):
+        ids.append(store.add(f"task {i}", priority=rng.choice(PRIORITIES)).id)
+        check_weights(store, picker)
+
+    for task_id in rng.sample(ids, 15):
+        store.update(task_id, priority=rng.choice(PRIORITIES), due="2026-03-03")
+    store.record_sprint(ids[0])
+    check_weights(store, picker)
+
+    for task_id in ids[::2]:
+        store.complete(task_id)
+    check_weights(store, picker)
+
+    # Freed slots are reused before the tree grows
+    size = len(picker._task_ids)
+    for i in range(20):
+        store.add(f"more {i}")
+    assert len(picker._task_ids) == size
+    check_weights(store, picker)
+
+
+def test_completed_tasks_are_never_picked():
+    store, picker = make_picker(seed=3)
+    tasks = [store.add(f"task {i}") for i in range(10)]
+    done = {t.id for t in tasks[:7]}
+    for task_id in done:
+        store.complete(task_id)
+
+    for _ in range(200):
+        assert picker.pick().id not in done
+    check_weights(store, picker)
+
+    for task in tasks[7:]:
+        store.complete(task.id)
+    assert picker.pick() is None
+
+
+def test_reset_rebuilds_from_the_store():
+    store, picker = make_picker()
+    store.add("old")
+    store.load([{"id": 5, "title": "loaded", "created": "2026-02-01T08:00:00"}])
+    check_weights(store, picker)
+    assert picker.pick().title == "loaded"
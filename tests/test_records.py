@@ -0,0 +1,102 @@
+"""SprintLog and SleepLog read back exactly the strings they were given."""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import ReviewList, SleepLog, SprintLog  # noqa: E402
+
+SPRINTS = [
+    "2026-03-02T09:05:00",
+    "2026-03-02T09:35:12.500000",
+    "1969-12-31T23:59:59.999999",
+    "2026-03-03T10:00:00+01:00",  # timezone: kept verbatim
+    "2026-03-03 10:30:00",  # space separator: kept verbatim
+    "not a timestamp",
+]
+SLEEP = [
+    "Sleep at 2026-03-01 23:10",
+    "Wake at 2026-03-02 07:05",
+    "Nap at 1969-12-31 13:00",
+    "Sleep at 2026-03-02 23:10:30",  # seconds: kept verbatim
+    "garbage",
+]
+
+
+def test_sprint_log_round_trips():
+    log = SprintLog(SPRINTS)
+    assert list(log) == SPRINTS
+    assert log == SPRINTS
+    assert log.to_list() == SPRINTS
+    assert [log[i] for i in range(-len(SPRINTS), 0)] == SPRINTS
+    assert log.copy() == SPRINTS
+    assert "2026-03-03T10:00:00+01:00" in log
+    assert "2026-03-02T09:35:12.5" not in log
+
+
+def test_sleep_log_round_trips():
+    log = SleepLog(SLEEP)
+    assert list(log) == SLEEP
+    assert log.copy() == SLEEP
+    assert "Wake at 2026-03-02 07:05" in log
+    assert "Wake at 2026-03-02 07:06" not in log
+
+
+def test_sleep_log_lookups_leave_the_kind_table_alone():
+    log = SleepLog(["Sleep at 2026-03-01 23:10"])
+    for i in range(300):
+        assert f"Kind{i} at 2026-03-01 23:10" not in log
+    assert log._kinds == ["Sleep"]
+
+    # Lookups can't fill the table, so new kinds still encode compactly
+    log.append("Wake at 2026-03-02 07:05")
+    assert log._kinds == ["Sleep", "Wake"] and log._odd == {}
+    log.append("Nap at 2026-03-02 99:00")
+    assert log._kinds == ["Sleep", "Wake"] and log[-1] == "Nap at 2026-03-02 99:00"
+
+
+def test_edits_keep_verbatim_strings_in_place():
+    log = SprintLog(SPRINTS)
+    expected = list(SPRINTS)
+    for items in (log, expected):
+        items[0] = "odd one"
+        items[3] = "2026-03-04T08:00:00"
+        del items[1]
+        items.insert(0, "2026-03-01T08:00:00+02:00")
+        items.append("2026-03-05T08:00:00")
+    assert log == expected
+
+    del log[-1], expected[-1]
+    assert log == expected
+    log.clear()
+    assert log == []
+
+
+def test_datetimes_between_and_day_counts():
+    log = SprintLog(SPRINTS)
+    between = log.datetimes_between(datetime(2026, 3, 2), datetime(2026, 3, 4))
+    assert sorted(between) == [
+        datetime(2026, 3, 2, 9, 5),
+        datetime(2026, 3, 2, 9, 35, 12, 500000),
+        datetime(2026, 3, 3, 10, 0),
+        datetime(2026, 3, 3, 10, 30),
+    ]
+    assert log.day_counts() == {"2026-03-02": 2, "2026-03-03": 2, "1969-12-31": 1}
+
+    sleep = SleepLog(SLEEP)
+    # The bound is exclusive even for a kind that sorts after "Sleep"
+    assert sleep.datetimes_between(datetime(2026, 3, 1, 23, 10), datetime(2026, 3, 2, 7, 5)) == [
+        datetime(2026, 3, 1, 23, 10),
+    ]
+    assert sleep.day_counts() == {"2026-03-01": 1, "2026-03-02": 2, "1969-12-31": 1}
+
+
+def test_review_list_wraps_and_unwraps():
+    reviews = ReviewList([{"week_start": "2026-03-02", "wins": "shipped", "mood": 4}])
+    reviews.append({"week_start": "2026-03-09", "wins": ""})
+    assert reviews[0]["mood"] == 4
+    assert reviews.to_list() == [
+        {"week_start": "2026-03-02", "wins": "shipped", "mood": 4},
+        {"week_start": "2026-03-09", "wins": ""},
+    ]
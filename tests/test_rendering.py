@@ -0,0 +1,61 @@
+"""The render mode falls back to the opaque backend wherever acrylic can't run."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+import acrylic  # noqa: E402
+import rendering  # noqa: E402
+
+
+@pytest.fixture
+def platform(monkeypatch):
+    """Set (acrylic supported, on battery) for the test."""
+    monkeypatch.delenv(rendering.RENDER_ENV, raising=False)
+
+    def configure(supported, battery):
+        monkeypatch.setattr(acrylic, "is_supported", lambda: supported)
+        monkeypatch.setattr(rendering, "on_battery", lambda: battery)
+    return configure
+
+
+def test_auto_picks_acrylic_only_on_mains_power(platform):
+    platform(supported=True, battery=False)
+    assert rendering.resolve_mode(None) == "acrylic"
+    assert rendering.resolve_mode("auto") == "acrylic"
+
+    platform(supported=True, battery=True)
+    assert rendering.resolve_mode("auto") == "opaque"
+
+    platform(supported=False, battery=False)
+    assert rendering.resolve_mode("auto") == "opaque"
+
+
+def test_explicit_modes(platform):
+    platform(supported=True, battery=True)
+    assert rendering.resolve_mode("acrylic") == "acrylic"
+    assert rendering.resolve_mode("opaque") == "opaque"
+    assert rendering.resolve_mode("sparkly") == "opaque"
+
+    platform(supported=False, battery=False)
+    assert rendering.resolve_mode("acrylic") == "opaque"
+    assert isinstance(rendering.select_backend("acrylic"), rendering.OpaqueBackend)
+
+
+def test_environment_overrides_the_setting(platform, monkeypatch):
+    platform(supported=True, battery=False)
+    monkeypatch.setenv(rendering.RENDER_ENV, "opaque")
+    assert rendering.resolve_mode("acrylic") == "opaque"
+
+    monkeypatch.setenv(rendering.RENDER_ENV, "bogus")
+    assert rendering.resolve_mode("opaque") == "acrylic"
+
+
+def test_opaque_ticks_just_after_each_countdown_step():
+    opaque, acrylic_backend = rendering.OpaqueBackend(), rendering.AcrylicBackend()
+    assert opaque.next_tick_ms(None) == 1000
+    assert opaque.next_tick_ms(0) == opaque.tick_margin_ms
+    assert opaque.next_tick_ms(730) == 730 + opaque.tick_margin_ms
+    assert acrylic_backend.next_tick_ms(730) == acrylic_backend.tick_interval_ms
@@ -0,0 +1,112 @@
+"""The snapshot plus change log survives crashes and replays to the saved data."""
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+from storage import Store, load_store, log_path_for  # noqa: E402
+
+
+def task(id, title="t"):
+    return {"id": id, "title": title, "created": "2026-03-02T09:00:00"}
+
+
+def open_store(tmp_path, **kwargs):
+    store = Store(str(tmp_path / "data.json"), **kwargs)
+    return store, store.load()
+
+
+def read_records(store):
+    with open(store.path, "rb") as f:
+        crc = zlib.crc32(f.read())
+    return storage.read_log(log_path_for(store.path), crc)[0]
+
+
+def test_appends_and_task_changes_replay(tmp_path):
+    store, data = open_store(tmp_path)
+    store.save({"tasks": [task(1), task(2), task(3)]})
+    sprints = ["2026-03-02T09:05:00"]
+    store.save({"sprint_blocks": sprints})
+    sprints.append("2026-03-02T09:15:00")
+    store.save({"sprint_blocks": sprints},
+               {"tasks": {2: task(2, "renamed"), 3: None}, "task_archive": {3: task(3)}})
+
+    data = load_store(store.path)
+    assert data["sprint_blocks"] == sprints
+    assert data["tasks"] == [task(1), task(2, "renamed")]
+    assert data["task_archive"] == [task(3)]
+    with open(store.log_path, "rb") as f:
+        log = f.read()
+    # The second sprint went in as one extend, not the whole list again
+    assert log.count(b"2026-03-02T09:05:00") == 1
+
+
+def test_replaced_list_is_logged_whole(tmp_path):
+    store, data = open_store(tmp_path)
+    store.save({"sprint_blocks": ["a", "b", "c"]})
+    store.save({"sprint_blocks": ["c", "d"]})  # tiered out, then one more
+    store.save({"sprint_blocks": []})
+    assert load_store(store.path)["sprint_blocks"] == []
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    store, data = open_store(tmp_path)
+    store.save({"sleep_log": ["Sleep at 2026-03-01 23:10"]})
+    store.save({"sleep_log": ["Sleep at 2026-03-01 23:10", "Wake at 2026-03-02 07:00"]})
+    store._close_log()
+    with open(store.log_path, "rb+") as f:
+        f.truncate(os.path.getsize(store.log_path) - 3)
+
+    with open(store.path, "rb") as f:
+        snapshot = f.read()
+    store, data = open_store(tmp_path)
+    assert data["sleep_log"] == ["Sleep at 2026-03-01 23:10"]
+    assert store.recovered == 1 and store.dropped_bytes > 0
+    # The tail is cut off in place; the snapshot isn't rewritten
+    with open(store.path, "rb") as f:
+        assert f.read() == snapshot
+    assert len(read_records(store)) == 1
+
+    # and appending carries on after the good records
+    store.save({"sleep_log": ["Sleep at 2026-03-01 23:10", "Wake at 2026-03-02 07:30"]})
+    assert load_store(store.path)["sleep_log"] == ["Sleep at 2026-03-01 23:10", "Wake at 2026-03-02 07:30"]
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    store, data = open_store(tmp_path)
+    store.save({"sprint_blocks": ["a"]})
+    store.save({"sprint_blocks": ["a", "b"]})
+    store._close_log()
+    with open(store.log_path, "rb+") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"xx")
+    assert load_store(store.path)["sprint_blocks"] == ["a"]
+
+
+def test_log_of_a_stale_snapshot_is_ignored(tmp_path):
+    store, data = open_store(tmp_path)
+    store.save({"sprint_blocks": ["a", "b"]})
+    store._close_log()
+    # Crash after the new snapshot replaced data.json, before the log reset:
+    # the extend is already in the snapshot and must not be applied twice
+    storage._write_snapshot(store.path, dict(data, sprint_blocks=["a", "b"]))
+
+    store, data = open_store(tmp_path)
+    assert data["sprint_blocks"] == ["a", "b"]
+    assert store.recovered == 0
+
+
+def test_log_is_compacted_into_the_snapshot(tmp_path):
+    store, data = open_store(tmp_path, compact_bytes=2048)
+    sprints = []
+    for i in range(200):
+        sprints.append(f"2026-03-02T{i // 60:02d}:{i % 60:02d}:00")
+        store.save({"sprint_blocks": sprints})
+        assert os.path.getsize(store.log_path) < 2048 + 200
+    assert load_store(store.path)["sprint_blocks"] == sprints
+
+    store.close()
+    assert read_records(store) == []
+    assert load_store(store.path)["sprint_blocks"] == sprints
@@ -0,0 +1,108 @@
+"""TaskStore keeps its tag, priority and due indexes in step with every change."""
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from clock import SimulatedClock  # noqa: E402
+from task_store import TaskStore  # noqa: E402
+
+
+def make_store():
+    # Monday 2026-03-02
+    return TaskStore(clock=SimulatedClock(datetime(2026, 3, 2, 9, 0)))
+
+
+def titles(tasks):
+    return [t.title for t in tasks]
+
+
+def test_indexes_follow_add_update_and_complete():
+    store = make_store()
+    report = store.add("write report", tags=["Work", " docs "], priority="high", due="2026-03-04")
+    store.add("water plants", tags=["home"], due="2026-03-10")
+    store.add("call bank", priority="urgent")
+
+    assert store.tags() == ["docs", "home", "work"]
+    assert titles(store.with_tag("WORK")) == ["write report"]
+    assert titles(store.at_least_priority("high")) == ["write report", "call bank"]
+    assert titles(store.due_between(date(2026, 3, 1), date(2026, 3, 5))) == ["write report"]
+
+    store.update(report.id, tags=["home"], priority="low", due="2026-03-20")
+    assert store.tags() == ["home"]
+    assert titles(store.with_tag("home")) == ["write report", "water plants"]
+    assert titles(store.with_priority("low")) == ["write report"]
+    assert titles(store.due_between(None, None)) == ["water plants", "write report"]
+
+    store.complete(report.id)
+    assert titles(store.with_tag("home")) == ["water plants"]
+    assert store.with_priority("low") == []
+    assert titles(store.due_between(None, None)) == ["water plants"]
+
+
+def test_query_combines_terms():
+    store = make_store()
+    store.add("write report", tags=["work"], priority="high", due="2026-03-02")
+    store.add("review report", tags=["work"], due="2026-03-06")
+    store.add("pay rent", tags=["home"], priority="urgent", due="2026-02-27")
+    store.add("plan trip", tags=["home"], due="2026-03-12")
+
+    assert titles(store.query("tag:work")) == ["write report", "review report"]
+    assert titles(store.query("due:today")) == ["write report"]
+    assert titles(store.query("due:week")) == ["write report", "review report"]
+    assert titles(store.query("due:overdue")) == ["pay rent"]
+    assert titles(store.query("tag:work priority:high")) == ["write report"]
+    assert titles(store.query("tag:home REPORT")) == []
+    assert titles(store.query("report")) == ["write report", "review report"]
+    assert titles(store.query("due:week", today=date(2026, 3, 9))) == ["plan trip"]
+
+
+def test_complete_moves_task_to_archive():
+    store = make_store()
+    task = store.add("write report", tags=["work"])
+    store.clock.advance(hours=2)
+
+    assert store.complete(task.id) is task
+    assert store.get(task.id) is None
+    assert len(store) == 0
+    assert store.archive == [task]
+    assert task.completed == "2026-03-02T11:00:00"
+    assert store.complete(task.id) is None
+
+    # Ids stay unique across a reload of active and archived tasks
+    store.load(store.to_list(), store.archive_to_list())
+    assert store.add("next").id == task.id + 1
+
+
+def test_missing_created_is_stamped_from_the_store_clock():
+    store = make_store()
+    store.load(["old bare string"], [{"id": 7, "title": "done", "completed": "2026-01-01T08:00:00"}])
+    store.import_task({"title": "imported"})
+
+    stamps = {t.title: t.created for t in list(store) + store.archive}
+    assert stamps == dict.fromkeys(["old bare string", "done", "imported"], "2026-03-02T09:00:00")
+
+
+def test_failing_listener_rolls_back_the_change():
+    store = make_store()
+    task = store.add("write report", tags=["work"])
+    seen = []
+    store.subscribe(lambda event, t: seen.append(event))
+
+    def reject(event, t):
+        raise RuntimeError("disk full")
+    store.subscribe(reject)
+
+    with pytest.raises(RuntimeError):
+        store.complete(task.id)
+    assert store.get(task.id) is task and task.completed is None
+    assert store.archive == []
+    assert titles(store.with_tag("work")) == ["write report"]
+
+    with pytest.raises(RuntimeError):
+        store.add("another")
+    assert titles(store) == ["write report"]
+    assert seen == ["remove", "add", "add", "discard"]
@@ -0,0 +1,417 @@
+"""Streaming export/import of tasks, sprints, sleep log and weekly reviews.
+
+Every stage is a generator, so records flow one at a time from the source
+to the sink and a multi-year history never has to be materialised twice:
+
+    write_ndjson(with_progress(iter_records(data), report), out)
+    Importer(...).run(with_progress(read_records(path), report))
+
+Run from the command line:
+
+    python transfer.py export history.ndjson
+    python transfer.py export sprints.csv --kinds sprint
+    python transfer.py import history.ndjson
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+
+from archive import ArchiveStore, archive_dir_for, sleep_year, sprint_year
+from storage import load_store, save_store
+from task_store import PRIORITIES, Task, TaskStore
+
+KINDS = ("task", "sprint", "sleep", "review")
+CSV_FIELDS = (
+    "kind", "id", "title", "tags", "priority", "due", "created", "completed",
+    "sprint_count", "last_sprint", "timestamp", "event",
+    "week_start", "wins", "struggles", "improvements", "priorities", "updated",
+)
+REVIEW_FIELDS = ("wins", "struggles", "improvements", "priorities")
+REQUIRED_FIELDS = {
+    "task": ("title",),
+    "sprint": ("timestamp",),
+    "sleep": ("event", "timestamp"),
+    "review": ("week_start",),
+}
+# Formats the app parses these fields with; anything else breaks it later
+DATE_FIELDS = {"task": ("due",), "review": ("week_start",)}
+DATETIME_FIELDS = {
+    "task": ("created", "completed", "last_sprint", "updated"),
+    "sprint": ("timestamp",),
+    "review": ("updated",),
+}
+TEXT_FIELDS = {"task": ("title",), "sleep": ("event",), "review": REVIEW_FIELDS}
+DATE_FORMAT = "%Y-%m-%d"
+SLEEP_FORMAT = "%Y-%m-%d %H:%M"
+IMPORT_BATCH_SIZE = 500
+
+
+def format_for(path):
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+# Sources
+def iter_records(data, kinds=KINDS):
+    """Yield flat records from a store dict in the layout of data.json."""
+    if "task" in kinds:
+        for task in data.get("tasks", ()):
+            if isinstance(task, str):
+                task = {"title": task}
+            yield {"kind": "task", **task}
+        for task in data.get("task_archive", ()):
+            yield {"kind": "task", **task}
+    if "sprint" in kinds:
+        for ts in data.get("sprint_blocks", ()):
+            yield {"kind": "sprint", "timestamp": ts}
+    if "sleep" in kinds:
+        for entry in data.get("sleep_log", ()):
+            event, _, ts = entry.partition(" at ")
+            yield {"kind": "sleep", "event": event, "timestamp": ts}
+    if "review" in kinds:
+        for review in data.get("weekly_reviews", ()):
+            yield {"kind": "review", **review}
+
+
+def iter_history(data, archive, kinds=KINDS):
+    """Yield records from the archive segments followed by the hot store."""
+    for segment in archive.segment_data():
+        yield from iter_records(segment, kinds)
+    yield from iter_records(data, kinds)
+
+
+def count_history(data, archive, kinds=KINDS):
+    archived = archive.counts()
+    return count_records(data, kinds) + sum(archived[k] for k in kinds)
+
+
+def count_records(data, kinds=KINDS):
+    sizes = {
+        "task": len(data.get("tasks", ())) + len(data.get("task_archive", ())),
+        "sprint": len(data.get("sprint_blocks", ())),
+        "sleep": len(data.get("sleep_log", ())),
+        "review": len(data.get("weekly_reviews", ())),
+    }
+    return sum(sizes[k] for k in kinds)
+
+
+def _tracked_lines(f, size, progress, every=1000):
+    done = 0
+    for i, line in enumerate(f, start=1):
+        done += len(line.encode("utf-8"))
+        if progress and i % every == 0:
+            progress(done, size)
+        yield line
+    if progress:
+        progress(size, size)
+
+
+def read_ndjson(path, progress=None):
+    """Yield (line number, record) pairs."""
+    size = os.path.getsize(path)
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(_tracked_lines(f, size, progress), start=1):
+            line = line.strip()
+            if line:
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    raise ValueError(f"line {number}: not valid JSON") from None
+
+
+def read_csv(path, progress=None):
+    """Yield (line number, record) pairs."""
+    size = os.path.getsize(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(_tracked_lines(f, size, progress))
+        for row in reader:
+            record = {k: v for k, v in row.items() if v not in ("", None)}
+            if "tags" in record:
+                record["tags"] = [t for t in record["tags"].split(",") if t]
+            if record.get("sprint_count", "").isdigit():
+                record["sprint_count"] = int(record["sprint_count"])
+            yield reader.line_num, record
+
+
+def _parses(parse, value):
+    try:
+        parse(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_formatted(value, fmt):
+    # A round trip, since strptime alone accepts "2026-3-4", which
+    # fromisoformat then rejects
+    try:
+        return datetime.strptime(value, fmt).strftime(fmt) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def check_record(record):
+    """Raise ValueError saying why a record can't be imported.
+
+    Fields are checked in the formats the app reads them back with, so a
+    CSV re-saved by a spreadsheet ("3/4/2026") is rejected here rather than
+    breaking the picker or the task list once it is in the store.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("not an object")
+    kind = record.get("kind")
+    missing = [f for f in REQUIRED_FIELDS.get(kind, ()) if not record.get(f)]
+    if missing:
+        raise ValueError(f"{kind} has no {', '.join(missing)}")
+    for field in TEXT_FIELDS.get(kind, ()):
+        if not isinstance(record.get(field, ""), str):
+            raise ValueError(f"{kind} {field} is not text")
+    for field in DATE_FIELDS.get(kind, ()):
+        value = record.get(field)
+        if value is not None and not _is_formatted(value, DATE_FORMAT):
+            raise ValueError(f"{kind} {field} {value!r} is not a YYYY-MM-DD date")
+    for field in DATETIME_FIELDS.get(kind, ()):
+        value = record.get(field)
+        if value is not None and not _parses(datetime.fromisoformat, value):
+            raise ValueError(f"{kind} {field} {value!r} is not an ISO date and time")
+    if kind == "sleep":
+        if " at " in record["event"]:
+            raise ValueError(f"sleep event {record['event']!r} contains ' at '")
+        if not _is_formatted(record["timestamp"], SLEEP_FORMAT):
+            raise ValueError(f"sleep timestamp {record['timestamp']!r} is not YYYY-MM-DD HH:MM")
+    elif kind == "task":
+        priority = record.get("priority")
+        if priority is not None and priority not in PRIORITIES:
+            raise ValueError(f"task priority {priority!r} is not one of {', '.join(PRIORITIES)}")
+        tags = record.get("tags", [])
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            raise ValueError("task tags are not a list of text")
+        count = record.get("sprint_count", 0)
+        if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+            raise ValueError(f"task sprint_count {count!r} is not a whole number")
+
+
+def validated(numbered):
+    """Pass records through, raising ValueError at the first one that can't be imported."""
+    for number, record in numbered:
+        try:
+            check_record(record)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+        yield record
+
+
+def read_records(path, progress=None):
+    """Yield records from an NDJSON or CSV file; progress gets (bytes_read, total)."""
+    if format_for(path) == "csv":
+        return validated(read_csv(path, progress))
+    return validated(read_ndjson(path, progress))
+
+
+# Intermediate stages
+def with_progress(records, progress, total=None, every=1000):
+    """Pass records through, calling progress(done, total) every few records."""
+    done = 0
+    for done, record in enumerate(records, start=1):
+        if done % every == 0:
+            progress(done, total)
+        yield record
+    progress(done, total)
+
+
+def batched(records, size):
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Sinks
+def write_ndjson(records, f):
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records, f):
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for record in records:
+        if "tags" in record:
+            record = {**record, "tags": ",".join(record["tags"])}
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def export_records(records, path):
+    """Write records to path in the format implied by its extension."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if format_for(path) == "csv":
+            return write_csv(records, f)
+        return write_ndjson(records, f)
+
+
+class Importer:
+    """Merge imported records into the in-memory collections, a batch at a time.
+
+    Sprints and sleep events already present (in the hot lists or, given an
+    archive, in its segments for that year) are skipped, reviews replace the
+    entry for the same week, and tasks get fresh ids in the target store.
+    Tasks match on title and creation time; a task without one (a
+    hand-written CSV row) matches on title, tags, priority and due date
+    instead, so importing the same file twice adds nothing.
+
+    Each batch is checked in full before any of it is applied. Callers
+    persist once after the last batch instead of per record.
+    """
+
+    def __init__(self, tasks, sprint_blocks, sleep_log, weekly_reviews, archive=None):
+        self.tasks = tasks
+        self.sprint_blocks = sprint_blocks
+        self.sleep_log = sleep_log
+        self.weekly_reviews = weekly_reviews
+        self.archive = archive
+        self._archived = {}  # (kind, year) -> set of archived records
+        self._sprints = set(sprint_blocks)
+        self._sleep = set(sleep_log)
+        self._task_keys = set()
+        self._task_contents = set()
+        for task in list(tasks) + tasks.archive:
+            self._task_keys.add((task.title, task.created))
+            self._task_contents.add(self._content(task))
+        self._checked = 0  # records checked so far, for error messages
+
+    @staticmethod
+    def _content(task):
+        return task.title, task.tags, task.priority, task.due
+
+    def _in_archive(self, kind, year, value):
+        if self.archive is None or not self.archive.has_year(year):
+            return False
+        known = self._archived.get((kind, year))
+        if known is None:
+            source = self.archive.sprints if kind == "sprint" else self.archive.sleep_log
+            known = self._archived[(kind, year)] = set(source(year))
+        return value in known
+
+    def add_batch(self, batch):
+        """Apply one batch; raises ValueError, applying nothing, if a record is bad."""
+        for number, record in enumerate(batch, start=self._checked + 1):
+            try:
+                check_record(record)
+            except ValueError as e:
+                raise ValueError(f"record {number}: {e}") from None
+        self._checked += len(batch)
+
+        added = 0
+        reviews = None
+        for record in batch:
+            kind = record.get("kind")
+            if kind == "sprint":
+                ts = record["timestamp"]
+                if ts not in self._sprints and not self._in_archive("sprint", sprint_year(ts), ts):
+                    self._sprints.add(ts)
+                    self.sprint_blocks.append(ts)
+                    added += 1
+            elif kind == "sleep":
+                entry = f"{record['event']} at {record['timestamp']}"
+                if entry not in self._sleep and not self._in_archive("sleep", sleep_year(entry), entry):
+                    self._sleep.add(entry)
+                    self.sleep_log.append(entry)
+                    added += 1
+            elif kind == "review":
+                review = dict.fromkeys(REVIEW_FIELDS, "")
+                review.update((k, v) for k, v in record.items() if k != "kind")
+                archived = self.archive and self.archive.get_review(review["week_start"])
+                if archived and {**dict.fromkeys(REVIEW_FIELDS, ""), **archived} == review:
+                    continue
+                if reviews is None:
+                    # Looked up per batch: saving a review between batches moves them
+                    reviews = {r["week_start"]: i for i, r in enumerate(self.weekly_reviews)}
+                index = reviews.get(review["week_start"])
+                if index is not None and dict(self.weekly_reviews[index]) == review:
+                    continue
+                if index is None:
+                    reviews[review["week_start"]] = len(self.weekly_reviews)
+                    self.weekly_reviews.append(review)
+                else:
+                    self.weekly_reviews[index] = review
+                added += 1
+            elif kind == "task":
+                task = {k: v for k, v in record.items() if k != "kind"}
+                content = self._content(Task.from_dict({**task, "id": None}))
+                if task.get("created"):
+                    key = (task["title"], task["created"])
+                    if key in self._task_keys:
+                        continue
+                elif content in self._task_contents:
+                    continue
+                imported = self.tasks.import_task(task)
+                self._task_keys.add((imported.title, imported.created))
+                self._task_contents.add(content)
+                added += 1
+        return added
+
+    def run(self, records, batch_size=IMPORT_BATCH_SIZE):
+        return sum(self.add_batch(batch) for batch in batched(records, batch_size))
+
+
+def _print_progress(done, total):
+    if total:
+        print(f"\r{done * 100 // total:3d}%", end="", file=sys.stderr, flush=True)
+    else:
+        print(f"\r{done} records", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="transfer", description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data.json", help="data file (default: data.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="export history to .ndjson or .csv")
+    p_export.add_argument("path")
+    p_export.add_argument("--kinds", default=",".join(KINDS),
+                          help="comma separated subset of: " + ", ".join(KINDS))
+
+    p_import = sub.add_parser("import", help="import history from .ndjson or .csv")
+    p_import.add_argument("path")
+
+    args = parser.parse_args(argv)
+    data = load_store(args.data)
+    archive = ArchiveStore(archive_dir_for(args.data))
+
+    if args.command == "export":
+        kinds = tuple(k for k in args.kinds.split(",") if k in KINDS)
+        total = count_history(data, archive, kinds)
+        records = with_progress(iter_history(data, archive, kinds), _print_progress, total)
+        count = export_records(records, args.path)
+        print(f"\nExported {count} records to {args.path}", file=sys.stderr)
+    else:
+        tasks = TaskStore()
+        tasks.load(data["tasks"], data["task_archive"])
+        importer = Importer(tasks, data["sprint_blocks"], data["sleep_log"], data["weekly_reviews"],
+                            archive)
+        try:
+            added = importer.run(read_records(args.path, _print_progress))
+        except ValueError as e:
+            print(f"\nImport failed, nothing imported: {e}", file=sys.stderr)
+            return 1
+        data["tasks"] = tasks.to_list()
+        data["task_archive"] = tasks.archive_to_list()
+        save_store(args.data, data)
+        print(f"\nImported {added} records into {args.data}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
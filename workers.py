@@ -0,0 +1,144 @@
+"""Background jobs on a QThreadPool, with results delivered on the GUI thread.
+
+    runner.submit("stats:2026-10-19", compute, week, group="review",
+                  on_done=show_stats)
+
+``fn`` is called as ``fn(job, *args)`` on a pool thread. It should check
+``job.cancelled`` now and then, may report ``job.progress(done, total)`` and
+may hand over intermediate results with ``job.publish(obj)``. Callbacks
+(on_done, on_progress, on_partial, on_error) always run on the GUI thread.
+
+Submitting a key that is already running doesn't start a second job; the
+new callbacks are attached to the running one. Cancelling a job (directly or
+through its group, e.g. when the user leaves a page) stops callbacks from
+firing even if the function ignores the flag.
+"""
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class Cancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    done = Signal(object)
+    failed = Signal(str)
+    progress = Signal(int, int)
+    partial = Signal(object)
+
+
+class Job(QRunnable):
+    def __init__(self, key, group, fn, args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.group = group
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        self.signals = JobSignals()
+        self.on_done = []
+        self.on_progress = []
+        self.on_partial = []
+        self.on_error = []
+
+    # Called from the worker thread
+    def progress(self, done, total):
+        if self.cancelled:
+            raise Cancelled()
+        self.signals.progress.emit(done, total or 0)
+
+    def publish(self, obj):
+        if self.cancelled:
+            raise Cancelled()
+        self.signals.partial.emit(obj)
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args)
+        except Cancelled:
+            result = None
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+            return
+        self.signals.done.emit(result)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TaskRunner(QObject):
+    busy_changed = Signal(bool)
+
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.jobs = {}
+
+    @property
+    def busy(self):
+        return bool(self.jobs)
+
+    def is_running(self, key):
+        return key in self.jobs
+
+    def submit(self, key, fn, *args, group=None, on_done=None, on_progress=None,
+               on_partial=None, on_error=None):
+        job = self.jobs.get(key)
+        if job is None:
+            job = Job(key, group, fn, args)
+            job.signals.done.connect(lambda result, j=job: self._finish(j, result))
+            job.signals.failed.connect(lambda message, j=job: self._fail(j, message))
+            job.signals.progress.connect(lambda d, t, j=job: self._dispatch(j, j.on_progress, d, t))
+            job.signals.partial.connect(lambda obj, j=job: self._dispatch(j, j.on_partial, obj))
+            was_busy = self.busy
+            self.jobs[key] = job
+            self.pool.start(job)
+            if not was_busy:
+                self.busy_changed.emit(True)
+
+        for callbacks, callback in ((job.on_done, on_done), (job.on_progress, on_progress),
+                                    (job.on_partial, on_partial), (job.on_error, on_error)):
+            if callback is not None:
+                callbacks.append(callback)
+        return job
+
+    def cancel(self, key):
+        job = self.jobs.get(key)
+        if job is not None:
+            job.cancel()
+            self._forget(job)
+
+    def cancel_group(self, group):
+        for job in [j for j in self.jobs.values() if j.group == group]:
+            job.cancel()
+            self._forget(job)
+
+    def _dispatch(self, job, callbacks, *args):
+        if not job.cancelled:
+            for callback in callbacks:
+                callback(*args)
+
+    def _forget(self, job):
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+            if not self.jobs:
+                self.busy_changed.emit(False)
+
+    def _finish(self, job, result):
+        self._forget(job)
+        self._dispatch(job, job.on_done, result)
+
+    def _fail(self, job, message):
+        self._forget(job)
+        self._dispatch(job, job.on_error, message)
+
+    def shutdown(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+        self.jobs.clear()
+        self.pool.waitForDone(2000)